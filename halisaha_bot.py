@@ -6,10 +6,25 @@ WAR ZONE (23:54→00:00) + SCAVENGER MODE (03:25)
 """
 
 import os
+import re
 import sys
+import csv
+import gzip
+import json
+import hashlib
 import time
+import signal
 import smtplib
 import logging
+import asyncio
+import threading
+import urllib.parse
+import urllib.request
+from array import array
+from collections import Counter, deque
+from contextlib import contextmanager
+from html.parser import HTMLParser
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from selenium import webdriver
@@ -17,12 +32,26 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, UnexpectedAlertPresentException
-from datetime import datetime, timedelta
+from selenium.common.exceptions import (
+    TimeoutException, UnexpectedAlertPresentException, InvalidSessionIdException, NoSuchElementException,
+    JavascriptException
+)
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+try:
+    import websocket  # websocket-client - Opsiyonel DevTools taşıyıcısı (TRANSPORT=cdp)
+except ImportError:
+    websocket = None
 
 # Logging setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
+# Slot açılışları ve pencereler bu saat dilimine göre - Runner UTC olsa bile
+ISTANBUL = ZoneInfo("Europe/Istanbul")
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
 def parse_turkish_date(date_str):
     """Türkçe tarihi datetime objesine çevir"""
     try:
@@ -128,12 +157,287 @@ def get_navigation_direction(target_date_str, current_range_str):
         logging.error(f"❌ Yön belirleme hatası: {e}")
         return "next"
 
-def get_attack_mode():
-    """Saldırı modunu belirle"""
-    current_time = datetime.now()
-    hour = current_time.hour
-    minute = current_time.minute
+def rank_slot_candidates(slots, target_date_str, preferred_hours):
+    """Hedef tarihteki açık slotları tercih sırasına göre diz"""
+    open_hours = {slot['hour'] for slot in slots if slot['active'] and slot['date'] == target_date_str}
+    return [hour for hour in preferred_hours if hour in open_hours]
+
+def load_facilities(spec, default_url, default_hours):
+    """TARGET_FACILITIES JSON'unu tesis listesine çevir - Boş/bozuksa sadece varsayılan tesis
+
+    Örnek: [{"name": "Kalamış", "url": ".../kalamis-spor", "category": 2,
+             "preferred_hours": ["20:00/21:00", "19:00/20:00"]}, ".../fenerbahce-spor"]
+    Liste sırası eşit tercihte hangi tesisin önce deneneceğini belirler.
+    """
+    default = [{'name': 'Kalamış Spor Tesisi', 'url': default_url, 'preferred_hours': list(default_hours)}]
+    if not spec:
+        return default
+    
+    try:
+        items = json.loads(spec)
+    except ValueError as e:
+        logging.error(f"❌ TARGET_FACILITIES okunamadı, varsayılan tesis kullanılıyor: {e}")
+        return default
+    
+    facilities = []
+    for i, item in enumerate(items if isinstance(items, list) else []):
+        if isinstance(item, str):
+            item = {'url': item}
+        if not isinstance(item, dict) or not item.get('url'):
+            logging.warning(f"⚠️ Geçersiz tesis tanımı atlandı: {item}")
+            continue
+        
+        url = item['url']
+        if item.get('category') is not None:
+            parts = urllib.parse.urlsplit(url)
+            query = dict(urllib.parse.parse_qsl(parts.query))
+            query['activityCategories'] = str(item['category'])
+            url = urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+        
+        facilities.append({
+            'name': item.get('name') or f"Tesis {i + 1}",
+            'url': url,
+            'preferred_hours': list(item.get('preferred_hours') or default_hours)
+        })
+    
+    return facilities or default
+
+def rank_facility_candidates(snapshots, target_date_str, facilities):
+    """Tüm tesislerin açık slotlarını tek sırada diz - Önce saat tercihi, sonra tesis sırası
+
+    snapshots[i] i. tesisin slot listesi (okunamadıysa None).
+    """
+    ranked = []
+    for index, (facility, slots) in enumerate(zip(facilities, snapshots)):
+        if slots is None:
+            continue
+        preferred = facility['preferred_hours']
+        for hour in rank_slot_candidates(slots, target_date_str, preferred):
+            ranked.append((preferred.index(hour), index, hour))
+    
+    ranked.sort()
+    return [{'facility': index, 'hour': hour} for _, index, hour in ranked]
+
+def match_reservation_row(rows, target_hour):
+    """Rezervasyon tablosunda saate uyan onaylı satırı bul"""
+    # Saatler yazımdan bağımsız karşılaştırılır: "20:00/21:00" == "20:00 - 21:00" (TARİH KONTROLÜ YOK!)
+    check_hour = "-".join(re.findall(r"\d{1,2}:\d{2}", target_hour)) if target_hour else ""
+    
+    for cells in rows:
+        if len(cells) >= 3:  # En az 3 kolon: [Tesis], [Saat], [Durum]
+            hour_match = reservation_key(cells)[1] == check_hour if check_hour else True
+            if hour_match and ("Ön Onaylı" in cells[2] or "Onaylı" in cells[2]):
+                return cells
+    return None
+
+def reservation_key(cells):
+    """Satırın karşılaştırma anahtarı - (tesis, saat, durum), çıkarıcı farklarından bağımsız
+
+    Boşluk/satır sonu farkları (<br>, innerText) ve saat yazımı ("20:00 - 21:00",
+    "20:00-21:00") aynı anahtara düşer; fazladan kolonlar yok sayılır.
+    """
+    cells = list(cells) + [""] * (3 - len(cells))
+    facility = "".join(cells[0].split()).casefold()
+    hour = "-".join(re.findall(r"\d{1,2}:\d{2}", cells[1]))
+    status = "".join(cells[2].split()).casefold()
+    return (facility, hour, status)
+
+def diff_reservation_rows(baseline, rows):
+    """Baseline'da olmayan satırları döndür - Aynı satırdan birden fazla varsa sayıyla karşılaştır
+
+    Durum değişen satır (ör. Beklemede → Ön Onaylı) da yeni sayılır.
+    """
+    key = reservation_key
+    
+    remaining = Counter(key(cells) for cells in baseline)
+    fresh = []
+    for cells in rows:
+        if remaining[key(cells)] > 0:
+            remaining[key(cells)] -= 1
+        else:
+            fresh.append(cells)
+    return fresh
+
+# Kapanış etiketi olmayan HTML elemanları
+VOID_TAGS = {'br', 'img', 'input', 'hr', 'meta', 'link', 'wbr', 'col', 'source'}
+
+class ReservationTableParser(HTMLParser):
+    """MyReservation.aspx HTML'inden #AreaReservationTable satırlarını çıkar"""
+    
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self._table_depth = 0
+        self._in_body = False
+        self._row = None
+        self._cell = None
+        self._hidden_depth = 0
+    
+    @staticmethod
+    def _is_hidden(attrs):
+        style = (attrs.get('style') or "").replace(" ", "").lower()
+        return 'hidden' in attrs or 'display:none' in style
+    
+    def handle_starttag(self, tag, attrs):
+        if self._cell is not None:
+            # innerText ile aynı: gizli elemanların metni yok, <br> boşluk sayılır
+            if self._hidden_depth or (tag not in VOID_TAGS and self._is_hidden(dict(attrs))):
+                if tag not in VOID_TAGS:
+                    self._hidden_depth += 1
+                return
+            if tag == 'br':
+                self._cell.append(" ")
+                return
+        if tag == 'table':
+            if self._table_depth or dict(attrs).get('id') == 'AreaReservationTable':
+                self._table_depth += 1
+        elif not self._table_depth:
+            return
+        elif tag == 'tbody' and self._table_depth == 1:
+            self._in_body = True
+        elif tag == 'tr' and self._in_body and self._table_depth == 1:
+            self._row = []
+        elif tag == 'td' and self._row is not None:
+            self._cell = []
+    
+    def handle_endtag(self, tag):
+        if not self._table_depth:
+            return
+        if self._hidden_depth and tag != 'td':
+            self._hidden_depth -= 1
+            return
+        if tag == 'td' and self._cell is not None:
+            self._hidden_depth = 0
+            self._row.append(" ".join("".join(self._cell).split()))
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            self.rows.append(self._row)
+            self._row = None
+        elif tag == 'tbody' and self._table_depth == 1:
+            self._in_body = False
+        elif tag == 'table':
+            self._table_depth -= 1
+    
+    def handle_data(self, data):
+        if self._cell is not None and not self._hidden_depth:
+            self._cell.append(data)
+
+def parse_reservation_rows(html):
+    """Rezervasyon tablosu HTML'ini hücre metinleri listesine çevir"""
+    parser = ReservationTableParser()
+    parser.feed(html)
+    parser.close()
+    return parser.rows
+
+class CalendarParser(HTMLParser):
+    """Takvim HTML'inden hafta aralığını ve div.lesson slotlarını çıkar (helper snapshotSlots ile aynı çıktı)"""
+    
+    def __init__(self):
+        super().__init__()
+        self.range_parts = None
+        self.slots = []
+        self._range_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if self._range_depth:
+            # <br> gibi boş etiketlerin kapanışı gelmez - Derinliğe sayılmaz
+            if tag not in VOID_TAGS:
+                self._range_depth += 1
+            return
+        
+        attrs = dict(attrs)
+        classes = (attrs.get('class') or "").split()
+        
+        if 'yonlendirme-info' in classes and self.range_parts is None:
+            self.range_parts = []
+            self._range_depth = 1
+        elif tag == 'div' and 'lesson' in classes:
+            self.slots.append({
+                'date': attrs.get('data-dateformatted'),
+                'hour': attrs.get('data-hour'),
+                'active': 'active' in classes,
+                'state': attrs.get('class') or "",
+            })
+    
+    def handle_endtag(self, tag):
+        if self._range_depth:
+            self._range_depth -= 1
+    
+    def handle_data(self, data):
+        if self._range_depth:
+            self.range_parts.append(data)
+
+def parse_calendar_html(html, only_date=None):
+    """Takvim HTML'ini snapshot formatına çevir: {'range': ..., 'slots': [...]}"""
+    parser = CalendarParser()
+    parser.feed(html)
+    parser.close()
+    
+    slots = parser.slots
+    if only_date:
+        slots = [slot for slot in slots if slot['date'] == only_date]
+    
+    range_text = " ".join("".join(parser.range_parts).split()) if parser.range_parts is not None else None
+    return {'range': range_text, 'slots': slots}
+
+# Kayıt formatı değişirse artır - Eski korpus ayrı klasörde kalır
+CORPUS_VERSION = 1
+
+class CorpusRecorder:
+    """Canlı sayfaları offline test korpusuna kaydet
+    
+    Her kayıt gzip'li bir HTML dosyası ve manifest.jsonl'de bir satırdır. Satırda
+    canlı sayfadan helper ile okunan beklenen sonuç (expected) da tutulur; replay
+    harness parser çıktısını buna göre karşılaştırır.
+    """
+    
+    def __init__(self, root="corpus", version=CORPUS_VERSION, max_records=5000):
+        self.path = os.path.join(root, f"v{version}")
+        self.version = version
+        self.max_records = max_records
+        self.recorded = 0
+        self._last_digest = {}
+    
+    def record(self, kind, html, target_date_str, url, expected):
+        """Sayfayı kaydet - Aynı içerik art arda kaydedilmez"""
+        digest = hashlib.sha1(html.encode('utf-8')).hexdigest()
+        if self._last_digest.get(kind) == digest or self.recorded >= self.max_records:
+            return None
+        self._last_digest[kind] = digest
+        
+        os.makedirs(os.path.join(self.path, kind), exist_ok=True)
+        file_name = os.path.join(kind, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}.html.gz")
+        
+        with gzip.open(os.path.join(self.path, file_name), 'wt', encoding='utf-8') as f:
+            f.write(html)
+        
+        entry = {
+            'version': self.version, 'kind': kind, 'file': file_name, 'sha1': digest,
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+            'target_date': target_date_str, 'url': url, 'expected': expected,
+        }
+        with open(os.path.join(self.path, "manifest.jsonl"), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        
+        self.recorded += 1
+        return entry
     
+    @staticmethod
+    def load(root="corpus", version=CORPUS_VERSION):
+        """Manifest ve HTML'leri oku: [(entry, html), ...]"""
+        path = os.path.join(root, f"v{version}")
+        pages = []
+        with open(os.path.join(path, "manifest.jsonl"), encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                with gzip.open(os.path.join(path, entry['file']), 'rt', encoding='utf-8') as page:
+                    pages.append((entry, page.read()))
+        return pages
+
+def get_attack_mode(now=None):
+    """Saldırı modunu belirle - Pencereler açılış takviminden (Europe/Istanbul)"""
     # Environment variable kontrolü
     forced_mode = os.environ.get('ATTACK_MODE')
     if forced_mode == "SCAVENGER_ONLY":
@@ -141,23 +445,961 @@ def get_attack_mode():
     elif forced_mode == "WAR_ZONE_ONLY":
         return "WAR_ZONE"
     
-    # WAR ZONE: 23:54-00:10
-    if (hour == 23 and minute >= 54) or (hour == 0 and minute <= 10):
-        return "WAR_ZONE"
+    # WAR ZONE: 23:54-00:10, SCAVENGER: 03:20-03:45, diğer saatler STANDBY
+    return get_planner(now).mode_at(now or datetime.now(ISTANBUL))
+
+# Hedef gün -> haftanın günü
+DAY_MAP = {"PAZARTESI": 0, "SALI": 1, "CARSAMBA": 2, "PERSEMBE": 3}
+
+def parse_schedule_jobs(spec):
+    """'PAZARTESI:WAR_ZONE,SALI:SCAVENGER' formatındaki iş listesini çöz"""
+    jobs = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        
+        day, _, mode = item.partition(":")
+        day = day.strip().upper()
+        mode = (mode.strip() or "WAR_ZONE").upper()
+        
+        if day not in DAY_MAP or mode not in ("WAR_ZONE", "SCAVENGER"):
+            logging.error(f"❌ Geçersiz iş tanımı: '{item}'")
+            continue
+        jobs.append((day, mode))
+    return jobs
+
+def get_opening_instant(now=None, target_day=None):
+    """Slotların açılacağı gece yarısı anı - Runner'ın yerel saatinde (naive)"""
+    now = now or datetime.now()
     
-    # SCAVENGER MODE: 03:20-03:45
-    elif hour == 3 and 20 <= minute <= 45:
-        return "SCAVENGER"
+    if target_day:
+        entry = get_planner(now).next_opening(target_day, now)
+        if entry:
+            return entry['opening_runner']
     
-    # MAINTENANCE: Diğer saatler
-    else:
+    # Hedef gün yoksa: İstanbul'da öğleden sonraysak bir sonraki gece yarısı
+    local = to_istanbul(now)
+    opening_date = local.date() + timedelta(days=1 if local.hour >= 12 else 0)
+    return to_runner_local(datetime(opening_date.year, opening_date.month, opening_date.day, tzinfo=ISTANBUL))
+
+# Sabit tarihli resmi tatiller - Dini bayramlar her yıl kayar, HALISAHA_HOLIDAYS ile eklenir
+FIXED_HOLIDAYS = {
+    (1, 1): "Yılbaşı",
+    (4, 23): "Ulusal Egemenlik ve Çocuk Bayramı",
+    (5, 1): "Emek ve Dayanışma Günü",
+    (5, 19): "Atatürk'ü Anma, Gençlik ve Spor Bayramı",
+    (7, 15): "Demokrasi ve Milli Birlik Günü",
+    (8, 30): "Zafer Bayramı",
+    (10, 29): "Cumhuriyet Bayramı",
+}
+
+MONTH_NAMES_TR = [
+    "", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
+    "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"
+]
+
+def format_turkish_date(date_obj):
+    """Türkçe tarih formatı"""
+    return f"{date_obj.day} {MONTH_NAMES_TR[date_obj.month]} {date_obj.year}"
+
+def to_istanbul(moment):
+    """Naive (runner yerel saati) veya aware zamanı Europe/Istanbul'a çevir"""
+    return moment.astimezone(ISTANBUL)
+
+def to_runner_local(moment):
+    """Aware zamanı runner'ın yerel saatinde naive datetime'a çevir - datetime.now() ile kıyaslanabilir"""
+    return moment.astimezone().replace(tzinfo=None)
+
+def parse_holidays(spec):
+    """'2026-03-20:Ramazan Bayramı,2026-05-27' formatındaki ek tatilleri çöz -> {date: ad}"""
+    holidays = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        
+        day, _, name = item.partition(":")
+        try:
+            holidays[datetime.strptime(day.strip(), "%Y-%m-%d").date()] = name.strip() or "Tatil"
+        except ValueError:
+            logging.error(f"❌ Geçersiz tatil tanımı: '{item}'")
+    return holidays
+
+class OpeningPlanner:
+    """Açılış takvimi - Önümüzdeki N haftanın açılışları tek seferde hesaplanır
+    
+    Slotlar hedef günden 7 gün önce gece yarısı (Europe/Istanbul) açılır. Her kayıt
+    hedef tarihi, açılış anını (yerel + UTC), WAR ZONE / SCAVENGER pencerelerini ve
+    tatil bilgisini tutar. Aramalar (gün, açılış tarihi) anahtarlı sözlükten O(1).
+    """
+    
+    ADVANCE_DAYS = 7
+    WAR_ZONE = (timedelta(minutes=-6), timedelta(minutes=11))       # 23:54 - 00:10 (dahil)
+    SCAVENGER = (timedelta(hours=3, minutes=20), timedelta(hours=3, minutes=46))  # 03:20 - 03:45 (dahil)
+    JOB_WAR_ZONE = (timedelta(minutes=-6), timedelta(minutes=16))   # Scheduler iş penceresi
+    JOB_SCAVENGER = (timedelta(hours=3, minutes=25), timedelta(hours=3, minutes=45))
+    ACTIVE_FOR = timedelta(hours=5)  # Açılıştan 5 saat sonra hedef bir sonraki açılışa geçer
+    
+    def __init__(self, weeks=8, start=None, holidays=None, tz=ISTANBUL):
+        self.tz = tz
+        self.weeks = weeks
+        self.extra_holidays = dict(holidays or {})
+        
+        start = (start or datetime.now(tz)).astimezone(tz)
+        # Dünden başla - Gece yarısını yeni geçmiş bir açılış da tabloda olsun
+        self.start = start.date() - timedelta(days=1)
+        self.end = self.start + timedelta(weeks=weeks)
+        
+        self.entries = {}
+        self.by_date = {}
+        day = self.start
+        while day < self.end:
+            for name, weekday in DAY_MAP.items():
+                if day.weekday() == weekday:
+                    entry = self._build(name, day)
+                    self.entries[(name, day)] = entry
+                    self.by_date[day] = entry
+            day += timedelta(days=1)
+    
+    def holiday(self, date_obj):
+        """Tarih resmi tatil mi - Ad veya None"""
+        return self.extra_holidays.get(date_obj) or FIXED_HOLIDAYS.get((date_obj.month, date_obj.day))
+    
+    def _build(self, day_name, opening_date):
+        # Gece yarısı yerel saatle kurulur - UTC ofseti (DST dahil) zoneinfo'dan gelir
+        opening = datetime(opening_date.year, opening_date.month, opening_date.day, tzinfo=self.tz)
+        target_date = opening_date + timedelta(days=self.ADVANCE_DAYS)
+        war_zone_job = (opening + self.JOB_WAR_ZONE[0], opening + self.JOB_WAR_ZONE[1])
+        scavenger_job = (opening + self.JOB_SCAVENGER[0], opening + self.JOB_SCAVENGER[1])
+        
+        return {
+            'day': day_name,
+            'opening_date': opening_date,
+            'target_date': target_date,
+            'turkish_date': format_turkish_date(target_date),
+            'opening': opening,
+            'opening_utc': opening.astimezone(timezone.utc),
+            'opening_runner': to_runner_local(opening),
+            'war_zone': (opening + self.WAR_ZONE[0], opening + self.WAR_ZONE[1]),
+            'scavenger': (opening + self.SCAVENGER[0], opening + self.SCAVENGER[1]),
+            'jobs': {
+                'WAR_ZONE': {'opening': opening, 'start': war_zone_job[0], 'end': war_zone_job[1]},
+                'SCAVENGER': {'opening': scavenger_job[0], 'start': scavenger_job[0], 'end': scavenger_job[1]},
+            },
+            'holiday': self.holiday(target_date),
+        }
+    
+    def covers(self, now):
+        """Tablo bu an için bir sonraki açılışları içeriyor mu"""
+        local_date = now.astimezone(self.tz).date()
+        return self.start <= local_date and local_date + timedelta(days=self.ADVANCE_DAYS + 1) < self.end
+    
+    def next_opening(self, day_name, now):
+        """Hedef gün için geçerli açılış - Açılıştan 5 saate kadar aynı açılış döner"""
+        weekday = DAY_MAP.get(day_name.upper())
+        if weekday is None:
+            return None
+        
+        local = now.astimezone(self.tz)
+        first = (local - self.ACTIVE_FOR).date() + timedelta(days=1)
+        opening_date = first + timedelta(days=(weekday - first.weekday()) % 7)
+        return self.entries.get((day_name.upper(), opening_date))
+    
+    def mode_at(self, now):
+        """Bu an bir açılışın WAR ZONE veya SCAVENGER penceresinde mi"""
+        local = now.astimezone(self.tz)
+        for opening_date in (local.date(), local.date() + timedelta(days=1)):
+            entry = self.by_date.get(opening_date)
+            if not entry:
+                continue
+            if entry['war_zone'][0] <= local < entry['war_zone'][1]:
+                return "WAR_ZONE"
+            if entry['scavenger'][0] <= local < entry['scavenger'][1]:
+                return "SCAVENGER"
         return "STANDBY"
+    
+    def to_rows(self):
+        """JSON'a yazılabilir tablo - Golden takvim kontrolü ve scheduler için"""
+        rows = []
+        for (day_name, opening_date), entry in sorted(self.entries.items(), key=lambda item: item[0][1]):
+            rows.append({
+                'day': day_name,
+                'opening_date': opening_date.isoformat(),
+                'target_date': entry['target_date'].isoformat(),
+                'turkish_date': entry['turkish_date'],
+                'opening_local': entry['opening'].isoformat(),
+                'opening_utc': entry['opening_utc'].isoformat(),
+                'war_zone': [t.isoformat() for t in entry['war_zone']],
+                'scavenger': [t.isoformat() for t in entry['scavenger']],
+                'holiday': entry['holiday'],
+            })
+        return rows
+
+_planner = None
+
+def get_planner(now=None):
+    """Önbellekteki açılış takvimi - Ufuk dolunca yeniden üretilir"""
+    global _planner
+    now = now or datetime.now(ISTANBUL)
+    
+    if _planner is None or not _planner.covers(now):
+        _planner = OpeningPlanner(
+            weeks=int(os.environ.get('OPENING_WEEKS', '8')),
+            start=to_istanbul(now),
+            holidays=parse_holidays(os.environ.get('HALISAHA_HOLIDAYS'))
+        )
+        logging.info(f"📅 Açılış takvimi üretildi: {_planner.start} → {_planner.end} ({len(_planner.entries)} açılış)")
+    return _planner
+
+class RunTrace:
+    """Çalışma izi - Olayları zaman damgasıyla kaydet"""
+    
+    def __init__(self, max_events=2000):
+        self.started = time.time()
+        self.events = deque(maxlen=max_events)
+    
+    def event(self, kind, **data):
+        """Trace'e olay ekle"""
+        entry = {
+            'kind': kind,
+            'at': datetime.now().strftime('%H:%M:%S.%f')[:-3],
+            'elapsed': round(time.time() - self.started, 3),
+        }
+        entry.update(data)
+        self.events.append(entry)
+        return entry
+    
+    def find(self, kind):
+        """Belirli türdeki olayları getir"""
+        return [e for e in self.events if e['kind'] == kind]
+    
+    def save(self, path):
+        """Trace'i JSON olarak kaydet"""
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(list(self.events), f, ensure_ascii=False, indent=1, default=str)
+            logging.info(f"🧾 Trace kaydedildi: {path}")
+        except Exception as e:
+            logging.error(f"❌ Trace kaydetme hatası: {e}")
+
+# Hata sınıfları - Her birinin kurtarma maliyeti farklı
+FAILURE_TRANSIENT_DOM = "TRANSIENT_DOM"
+FAILURE_SESSION_LOST = "SESSION_LOST"
+FAILURE_WRONG_PAGE = "WRONG_PAGE"
+FAILURE_BROWSER_CRASHED = "BROWSER_CRASHED"
+
+# Chrome/chromedriver ölmüşse hata mesajında görünen ifadeler
+BROWSER_CRASH_MARKERS = (
+    "invalid session id", "chrome not reachable", "session deleted", "disconnected",
+    "no such window", "target window already closed", "tab crashed",
+    "connection refused", "max retries exceeded", "failed to establish a new connection"
+)
+
+class PageStateError(Exception):
+    """Tarayıcı beklenmeyen bir sayfada"""
+
+# Sayfa yükleme zaman aşımı (sn) - Watchdog komut sınırları bunun altına inmez
+PAGE_LOAD_TIMEOUT = 15
+
+class BrowserStalledError(Exception):
+    """WebDriver komutu sert zaman aşımını geçti - Sürücü takılı kabul edilir"""
+
+# Sürücüyle bağlantının gittiğini gösteren hatalar - Sadece bunlar (ve çökme işaretleri) yeniden başlatır
+BROWSER_CRASH_ERRORS = (InvalidSessionIdException, ConnectionError, BrowserStalledError)
+
+def is_browser_crash(error):
+    """Hata tarayıcı/sürücü bağlantısının kaybı mı - Alert ve geçici sürücü hataları değil"""
+    text = str(error).lower()
+    return isinstance(error, BROWSER_CRASH_ERRORS) or any(marker in text for marker in BROWSER_CRASH_MARKERS)
+
+def classify_failure(error, current_url, base_url):
+    """Hatayı sınıflandır: geçici DOM, oturum kaybı, yanlış sayfa veya tarayıcı çökmesi"""
+    if is_browser_crash(error):
+        return FAILURE_BROWSER_CRASHED
+    
+    # URL bağlantı hatası dışında bir nedenle okunamadı - Ucuz kurtarma, tekrarlarsa tırmanır
+    if current_url is None:
+        return FAILURE_TRANSIENT_DOM
+    
+    if "giris" in current_url:
+        return FAILURE_SESSION_LOST
+    if isinstance(error, PageStateError) or "MyReservation" in current_url or not current_url.startswith(base_url):
+        return FAILURE_WRONG_PAGE
+    
+    return FAILURE_TRANSIENT_DOM
+
+class RetryPolicy:
+    """Deadline-aware retry - Global deadline ve deneme başı süre sınırı"""
+    
+    def __init__(self, deadline=None, attempt_timeout=8):
+        self.deadline = deadline  # datetime veya None (sınırsız)
+        self.attempt_timeout = attempt_timeout
+    
+    def remaining(self):
+        """Global deadline'a kalan saniye"""
+        if self.deadline is None:
+            return float('inf')
+        return (self.deadline - datetime.now()).total_seconds()
+    
+    def expired(self):
+        return self.remaining() <= 0
+    
+    def attempt_budget(self):
+        """Bu deneme için harcanabilecek en fazla süre"""
+        return max(0, min(self.attempt_timeout, self.remaining()))
+    
+    def sleep(self, seconds):
+        """Deadline'ı aşmadan bekle"""
+        time.sleep(max(0, min(seconds, self.remaining())))
+    
+    def describe(self):
+        """Trace için kalan süre"""
+        return None if self.deadline is None else round(self.remaining(), 1)
+
+class SlotHistoryStore:
+    """Slot geçmişi - Append-only, kolon bazlı yerel depo
+    
+    Her yoklama üç kolona birer değer ekler: zaman (epoch sn), hedef gün (ordinal)
+    ve saat bazında müsaitlik bitmap'i (bit N = N:00 slotu açık).
+    """
+    
+    COLUMNS = (('ts', 'q'), ('target', 'i'), ('bitmap', 'I'))
+    
+    # Art arda iki gözlem arası en fazla bu kadar olabilir (en yavaş yoklama aralığının 2 katı)
+    MAX_GAP_SECONDS = 60
+    
+    def __init__(self, path="slot_history"):
+        self.path = path
+    
+    def _column_path(self, name):
+        return os.path.join(self.path, f"{name}.col")
+    
+    def append(self, observed_at, target_date, hours):
+        """Bir yoklamayı ekle - hours: müsait slotların başlangıç saatleri"""
+        bitmap = 0
+        for hour in hours:
+            bitmap |= 1 << hour
+        
+        values = {'ts': int(observed_at.timestamp()), 'target': target_date.toordinal(), 'bitmap': bitmap}
+        
+        os.makedirs(self.path, exist_ok=True)
+        for name, typecode in self.COLUMNS:
+            with open(self._column_path(name), 'ab') as f:
+                array(typecode, [values[name]]).tofile(f)
+    
+    def load(self):
+        """Tüm kolonları yükle - Yarım kalmış son yazımı kırp"""
+        columns = {}
+        for name, typecode in self.COLUMNS:
+            column = array(typecode)
+            path = self._column_path(name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    data = f.read()
+                usable = len(data) - len(data) % column.itemsize
+                column.frombytes(data[:usable])
+            columns[name] = column
+        
+        rows = min(len(c) for c in columns.values())
+        return {name: column[:rows] for name, column in columns.items()}
+    
+    @staticmethod
+    def opening_settled_at(target):
+        """Hedef günün açılış penceresinin bittiği an (epoch sn) - Gece yarısı açılışı iptal değildir"""
+        opening_date = datetime.fromordinal(target - OpeningPlanner.ADVANCE_DAYS)
+        opening = datetime(opening_date.year, opening_date.month, opening_date.day, tzinfo=ISTANBUL)
+        return (opening + OpeningPlanner.JOB_WAR_ZONE[1]).timestamp()
+    
+    def appearances(self, target_weekday=None):
+        """Sonradan açılan (iptal) slotlar: (gözlem zamanı, hedef gün, saat) listesi
+        
+        Açılış penceresi bitene kadarki gözlemler sadece referans olur; WAR ZONE'da
+        gece yarısı toplu açılan slotlar iptal sayılmaz. Önceki gözlemden
+        MAX_GAP_SECONDS'tan uzun süre sonra gelen gözlem de yeni referanstır -
+        Aradaki iptallerin ne zaman olduğu bilinmez, ilk yoklamaya yazılmaz.
+        """
+        columns = self.load()
+        last_seen = {}
+        settled_at = {}
+        events = []
+        
+        for ts, target, bitmap in sorted(zip(columns['ts'], columns['target'], columns['bitmap'])):
+            if target_weekday is not None and datetime.fromordinal(target).weekday() != target_weekday:
+                continue
+            
+            previous = last_seen.get(target)
+            last_seen[target] = (ts, bitmap)
+            if target not in settled_at:
+                settled_at[target] = self.opening_settled_at(target)
+            if previous is None or ts < settled_at[target] or ts - previous[0] > self.MAX_GAP_SECONDS:
+                continue
+            
+            new_bits = bitmap & ~previous[1]
+            hour = 0
+            while new_bits:
+                if new_bits & 1:
+                    events.append((datetime.fromtimestamp(ts), target, hour))
+                new_bits >>= 1
+                hour += 1
+        return events
+    
+    def cancellation_profile(self, target_weekday, bucket_minutes=1):
+        """Gün içi dakika kovası -> (iptal sayısı, gözlem sayısı)"""
+        columns = self.load()
+        profile = {}
+        
+        for ts, target in zip(columns['ts'], columns['target']):
+            if datetime.fromordinal(target).weekday() != target_weekday:
+                continue
+            observed = datetime.fromtimestamp(ts)
+            bucket = (observed.hour * 60 + observed.minute) // bucket_minutes
+            hits, polls = profile.get(bucket, (0, 0))
+            profile[bucket] = (hits, polls + 1)
+        
+        for observed, _, _ in self.appearances(target_weekday):
+            bucket = (observed.hour * 60 + observed.minute) // bucket_minutes
+            hits, polls = profile.get(bucket, (0, 0))
+            profile[bucket] = (hits + 1, polls)
+        
+        return profile
+    
+    def hour_profile(self, target_weekday):
+        """Saat bazında iptal sayısı - Hangi saatler sonradan açılıyor?"""
+        counts = {}
+        for _, _, hour in self.appearances(target_weekday):
+            counts[hour] = counts.get(hour, 0) + 1
+        return counts
+    
+    def scavenger_plan(self, target_weekday, window_start, duration_seconds,
+                       default_interval=8, hot_interval=4, cold_interval=30, min_polls=30):
+        """SCAVENGER penceresi için dakika başı yoklama aralıkları"""
+        minutes = int(duration_seconds // 60) + 1
+        profile = self.cancellation_profile(target_weekday)
+        
+        start_bucket = window_start.hour * 60 + window_start.minute
+        window = [profile.get((start_bucket + m) % 1440, (0, 0)) for m in range(minutes)]
+        
+        # Yeterli geçmiş yoksa eski sabit tempo
+        if sum(polls for _, polls in window) < min_polls:
+            return [default_interval] * minutes
+        
+        # İptallerin göründüğü dakikalar ve komşuları sıcak, gerisi ölü zaman
+        hot = set()
+        for m, (hits, _) in enumerate(window):
+            if hits:
+                hot.update((m - 1, m, m + 1))
+        
+        return [hot_interval if m in hot else cold_interval for m in range(minutes)]
+
+class PageLayoutError(Exception):
+    """Sayfa yapısı helper'ın beklediğinden farklı - Site değişmiş olabilir"""
+
+# Sayfa içi helper kütüphanesi - Her yeni dokümana bir kez yüklenir
+PAGE_HELPER_VERSION = 2
+PAGE_HELPER_JS = """
+(function() {
+    var VERSION = %d;
+    if (window.__hsb && window.__hsb.version === VERSION) { return; }
+    
+    // Anti-detection - Her dokümanda geçerli olsun
+    try { Object.defineProperty(navigator, 'webdriver', {get: function() { return undefined; }}); } catch (e) {}
+    
+    function layout(missing) { return {__hsb: 'layout', missing: missing}; }
+    function absent(missing) { return {__hsb: 'absent', missing: missing}; }
+    function readRange() {
+        var el = document.querySelector('.yonlendirme-info');
+        return el ? el.innerText.trim() : null;
+    }
+    function findSlot(date, hour) {
+        var slots = document.querySelectorAll('div.lesson.active');
+        for (var i = 0; i < slots.length; i++) {
+            if (slots[i].getAttribute('data-dateformatted') === date && slots[i].getAttribute('data-hour') === hour) {
+                return slots[i];
+            }
+        }
+        return null;
+    }
+    function click(el) {
+        if (!el) { return false; }
+        el.click();
+        return true;
+    }
+    function fnv(str, h) {
+        for (var i = 0; i < str.length; i++) {
+            h ^= str.charCodeAt(i);
+            h = Math.imul(h, 16777619) >>> 0;
+        }
+        return h;
+    }
+    function fingerprint(onlyDate) {
+        // Aralık + ilgili div.lesson durumlarının FNV-1a özeti - Slot listesi kurulmaz
+        var range = readRange();
+        if (range === null) { return null; }
+        var h = fnv(range, 2166136261);
+        var lessons = document.querySelectorAll('div.lesson');
+        for (var i = 0; i < lessons.length; i++) {
+            var date = lessons[i].getAttribute('data-dateformatted');
+            if (onlyDate && date !== onlyDate) { continue; }
+            h = fnv(date + '|' + lessons[i].getAttribute('data-hour') + '|' + lessons[i].className + ';', h);
+        }
+        return h.toString(16) + ':' + lessons.length;
+    }
+    
+    window.__hsb = {
+        version: VERSION,
+        readRange: function() {
+            var range = readRange();
+            return range === null ? absent(['yonlendirme-info']) : range;
+        },
+        snapshotSlots: function(onlyDate) {
+            var range = readRange();
+            if (range === null) { return absent(['yonlendirme-info']); }
+            var lessons = document.querySelectorAll('div.lesson');
+            var slots = [];
+            for (var i = 0; i < lessons.length; i++) {
+                var el = lessons[i];
+                var date = el.getAttribute('data-dateformatted');
+                var hour = el.getAttribute('data-hour');
+                if (date === null || hour === null) { return layout(['data-dateformatted', 'data-hour']); }
+                if (onlyDate && date !== onlyDate) { continue; }
+                slots.push({date: date, hour: hour, active: el.classList.contains('active'), state: el.className});
+            }
+            return {range: range, slots: slots};
+        },
+        gridFingerprint: function(onlyDate) {
+            var fp = fingerprint(onlyDate);
+            return fp === null ? absent(['yonlendirme-info']) : fp;
+        },
+        snapshotIfChanged: function(prevFingerprint, onlyDate) {
+            var fp = fingerprint(onlyDate);
+            if (fp === null) { return absent(['yonlendirme-info']); }
+            if (fp === prevFingerprint) { return {unchanged: true, fingerprint: fp}; }
+            var snapshot = this.snapshotSlots(onlyDate);
+            if (snapshot.__hsb) { return snapshot; }
+            snapshot.fingerprint = fp;
+            return snapshot;
+        },
+        clickNav: function(direction) {
+            var button = document.getElementById(direction === 'prev' ? 'area-onceki-hafta' : 'area-sonraki-hafta');
+            return button ? click(button) : layout([direction === 'prev' ? 'area-onceki-hafta' : 'area-sonraki-hafta']);
+        },
+        clickSlot: function(date, hour) {
+            var slot = findSlot(date, hour);
+            if (!slot) { return false; }
+            slot.scrollIntoView(true);
+            return click(slot);
+        },
+        startReservation: function() {
+            var popup = document.querySelector('.bootbox');
+            if (!popup) { return false; }
+            var radio = popup.querySelector("input[value='basvuru-yap']");
+            var devam = popup.querySelector('button.btn.btn-blue.devam-et');
+            if (!radio || !devam) { return layout(['basvuru-yap', 'devam-et']); }
+            radio.click();
+            devam.click();
+            return true;
+        },
+        confirmReservation: function() {
+            var checkbox = document.querySelector("input[type='checkbox']");
+            if (!checkbox) { return false; }
+            checkbox.click();
+            var buttons = document.querySelectorAll('button.btn.btn-blue');
+            for (var i = 0; i < buttons.length; i++) {
+                if (buttons[i].textContent.trim() === 'Evet') { return click(buttons[i]); }
+            }
+            return false;
+        },
+        readReservations: function() {
+            var table = document.getElementById('AreaReservationTable');
+            if (!table) { return absent(['AreaReservationTable']); }
+            var rows = table.querySelectorAll('tbody tr');
+            var out = [];
+            for (var i = 0; i < rows.length; i++) {
+                var cells = rows[i].querySelectorAll('td');
+                var row = [];
+                for (var j = 0; j < cells.length; j++) { row.push(cells[j].innerText.trim()); }
+                out.push(row);
+            }
+            return out;
+        }
+    };
+})();
+""" % PAGE_HELPER_VERSION
+
+# Helper'ı adıyla çağır - Sürüm tutmuyorsa çağrı yapılmaz
+PAGE_CALL_SCRIPT = """
+var h = window.__hsb;
+if (!h || h.version !== arguments[0]) { return {__hsb: 'missing', found: h ? h.version : null}; }
+return h[arguments[1]].apply(h, arguments[2]);
+"""
+
+class CdpTransportError(Exception):
+    """DevTools soketi kurulamadı veya koptu - Çağrı klasik WebDriver'a düşer"""
+
+class CdpTransport:
+    """Kalıcı DevTools websocket'i - Sıcak yoldaki script çağrıları chromedriver'a uğramaz
+
+    Her sekme için tek soket açılır. Komutlar id ile eşleştiği için art arda
+    gönderilip (pipelining) toplu beklenebilir; yanıt beklerken gelen olaylar
+    abonelere dağıtılır. Sayfada dialog açılırsa evaluate bloklanacağı için dialog
+    aynı soketten kapatılır ve UnexpectedAlertPresentException fırlatılır (klasik
+    akıştaki gibi) - Açık kalan dialog sonraki WebDriver komutlarını da düşürürdü.
+    """
+    
+    def __init__(self, debugger_address, timeout=8):
+        self.debugger_address = debugger_address
+        self.timeout = timeout
+        self.sockets = {}
+        self.handlers = {}
+        self.next_id = 0
+        self.lock = threading.Lock()
+    
+    @classmethod
+    def from_driver(cls, driver, timeout=8):
+        """Chromedriver'ın açtığı debug portuna bağlan"""
+        if websocket is None:
+            raise CdpTransportError("websocket-client kurulu değil")
+        
+        address = (driver.capabilities.get('goog:chromeOptions') or {}).get('debuggerAddress')
+        if not address:
+            raise CdpTransportError("Chrome debuggerAddress bildirmedi")
+        return cls(address, timeout)
+    
+    @staticmethod
+    def call_expression(script, args):
+        """execute_script gövdesini arguments'lı bir Runtime.evaluate ifadesine çevir"""
+        return "(function() {%s\n}).apply(null, %s)" % (script, json.dumps(list(args)))
+    
+    def subscribe(self, method, callback):
+        """CDP olayına abone ol - callback(handle, params)"""
+        self.handlers.setdefault(method, []).append(callback)
+    
+    def _socket(self, handle):
+        """Sekmenin soketini döndür, yoksa /json listesinden bulup bağlan"""
+        ws = self.sockets.get(handle)
+        if ws is not None:
+            return ws
+        
+        target_id = handle.replace('CDwindow-', '').upper()
+        try:
+            with urllib.request.urlopen(f"http://{self.debugger_address}/json", timeout=5) as response:
+                targets = json.loads(response.read().decode('utf-8'))
+            
+            match = [t for t in targets if t.get('type') == 'page' and t.get('id', '').upper() == target_id]
+            if not match:
+                raise CdpTransportError(f"Sekme DevTools listesinde yok: {handle}")
+            
+            # Origin göndermeyiz - Chrome aksi halde --remote-allow-origins ister
+            ws = websocket.create_connection(match[0]['webSocketDebuggerUrl'],
+                                             timeout=self.timeout, suppress_origin=True)
+        except (OSError, ValueError, websocket.WebSocketException) as e:
+            raise CdpTransportError(f"DevTools bağlantısı kurulamadı: {e}")
+        
+        self.sockets[handle] = ws
+        self._send(handle, ws, 'Page.enable', {})
+        return ws
+    
+    def _send(self, handle, ws, method, params):
+        self.next_id += 1
+        try:
+            ws.send(json.dumps({'id': self.next_id, 'method': method, 'params': params}))
+        except (OSError, websocket.WebSocketException) as e:
+            self.forget(handle)
+            raise CdpTransportError(f"{method} gönderilemedi: {e}")
+        return self.next_id
+    
+    def _collect(self, handle, ws, ids):
+        """Verilen id'lerin yanıtlarını topla - Araya giren olayları dağıt"""
+        deadline = time.time() + self.timeout
+        replies = {}
+        
+        while len(replies) < len(ids):
+            ws.settimeout(max(0.05, deadline - time.time()))
+            try:
+                message = json.loads(ws.recv())
+            except websocket.WebSocketTimeoutException:
+                raise TimeoutException(f"DevTools yanıtı {self.timeout}sn içinde gelmedi")
+            except (OSError, ValueError, websocket.WebSocketException) as e:
+                self.forget(handle)
+                raise CdpTransportError(f"DevTools soketi koptu: {e}")
+            
+            if 'id' in message:
+                # Önceki (iptal edilmiş) çağrıların geç yanıtları atılır
+                if message['id'] in ids:
+                    replies[message['id']] = message
+                continue
+            
+            method = message.get('method')
+            for callback in self.handlers.get(method, []):
+                callback(handle, message.get('params', {}))
+            if method == 'Page.javascriptDialogOpening':
+                self._send(handle, ws, 'Page.handleJavaScriptDialog', {'accept': False})
+                raise UnexpectedAlertPresentException(message.get('params', {}).get('message', 'dialog'))
+        
+        return [replies[i] for i in ids]
+    
+    @staticmethod
+    def _value(reply):
+        if 'error' in reply:
+            raise CdpTransportError(f"CDP hatası: {reply['error'].get('message')}")
+        
+        result = reply.get('result', {})
+        if 'exceptionDetails' in result:
+            details = result['exceptionDetails']
+            raise JavascriptException((details.get('exception') or {}).get('description') or details.get('text'))
+        return result.get('result', {}).get('value')
+    
+    def evaluate_many(self, handle, expressions):
+        """İfadeleri tek seferde gönder, yanıtları sırayla döndür (pipelining)"""
+        with self.lock:
+            ws = self._socket(handle)
+            ids = [self._send(handle, ws, 'Runtime.evaluate', {'expression': e, 'returnByValue': True})
+                   for e in expressions]
+            replies = self._collect(handle, ws, ids)
+        return [self._value(reply) for reply in replies]
+    
+    def evaluate(self, handle, expression):
+        return self.evaluate_many(handle, [expression])[0]
+    
+    def forget(self, handle):
+        """Sekmenin soketini bırak - Sekme kapandı veya tarayıcı yeniden başladı"""
+        ws = self.sockets.pop(handle, None)
+        if ws is not None:
+            try:
+                ws.close()
+            except Exception:
+                pass
+    
+    def close(self):
+        for handle in list(self.sockets):
+            self.forget(handle)
+
+class CommandWatchdog:
+    """WebDriver komutlarına sert zaman aşımı - driver.execute sarmalanır
+    
+    Komut tek bir işçi thread'inde çalışır. Navigasyon komutları (get/refresh)
+    sayfa yükleme zaman aşımı + pay kadar, diğerleri (executeScript, findElement,
+    getCurrentUrl) kısa sınır kadar bekler. Sınır aşılınca işçi thread takılı
+    komutla meşgul kalır - Aynı işçiye yeni komut sıralamak da takılacağından
+    sürücü hemen takılı işaretlenir ve BrowserStalledError ile yedek tarayıcıya
+    geçilir. Geç dönen komut başarıyla biterse işaret kalkar.
+    """
+    
+    # Sayfa yüklemesini bekleyen komutlar - Sınır sayfa yükleme zaman aşımından türetilir
+    NAVIGATION_COMMANDS = ('get', 'refresh', 'goBack', 'goForward')
+    # Kendi zaman aşımı olan diğer uzun komutlar
+    LONG_COMMANDS = {'w3cExecuteScriptAsync': 20, 'quit': 10}
+    
+    def __init__(self, driver, timeout=5, page_load_timeout=PAGE_LOAD_TIMEOUT):
+        # Kısa sınır implicit wait'in (3sn) üstünde kalmalı - Yoksa bulunamayan öğe takılma sayılır
+        self.timeout = timeout
+        self.limits = dict(self.LONG_COMMANDS)
+        self.limits.update({command: page_load_timeout + 3 for command in self.NAVIGATION_COMMANDS})
+        self.stalled = None
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver-watchdog")
+        self._execute = driver.execute
+        driver.execute = self.execute
+    
+    def _late_result(self, future):
+        """Zaman aşımına uğrayan komut sonunda başarıyla döndüyse sürücü sağlıklıdır"""
+        if future.exception() is None and self.stalled:
+            logging.info(f"✅ Geç dönen komut tamamlandı - Sürücü takılı değil ({self.stalled})")
+            self.stalled = None
+    
+    def execute(self, driver_command, params=None):
+        if self.stalled:
+            raise BrowserStalledError(f"Sürücü takılı ({self.stalled}) - {driver_command} gönderilmedi")
+        
+        limit = self.limits.get(driver_command, self.timeout)
+        future = self.executor.submit(self._execute, driver_command, params)
+        try:
+            return future.result(timeout=limit)
+        except FuturesTimeoutError:
+            self.stalled = driver_command
+            future.add_done_callback(self._late_result)
+            raise BrowserStalledError(f"{driver_command} {limit}s içinde dönmedi")
+    
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+class SharedTabExecutor:
+    """Paylaşılan tarayıcıda komut başı sekme kilidi - driver.execute sarmalanır
+    
+    Kilit bir işin tüm saldırısı boyunca değil, tek bir WebDriver komutu (ve
+    gerekiyorsa öncesindeki sekme geçişi) boyunca tutulur; bir işin uykuları ve
+    beklemeleri diğer işin komutlarını durdurmaz. Her thread'in istediği sekme
+    thread-local tutulur: tab_guard ile bağlanır, açık switch_to.window ile güncellenir.
+    """
+    
+    def __init__(self, lock, state):
+        self.lock = lock
+        self.state = state
+        self.local = threading.local()
+        self._execute = None
+    
+    def attach(self, driver):
+        """Yeni (veya yeniden başlatılmış) sürücüyü sar"""
+        self._execute = driver.execute
+        driver.execute = self.execute
+    
+    def bind(self, handle):
+        """Bu thread'in komutlarını sekmeye bağla - Önceki bağlamayı döndürür"""
+        previous = getattr(self.local, 'handle', None)
+        self.local.handle = handle
+        return previous
+    
+    def execute(self, driver_command, params=None):
+        wanted = getattr(self.local, 'handle', None)
+        
+        with self.lock:
+            if driver_command == 'switchToWindow':
+                response = self._execute(driver_command, params)
+                self.state['active'] = (params or {}).get('handle')
+                if wanted is not None:
+                    self.local.handle = self.state['active']
+                return response
+            
+            if wanted is not None and self.state.get('active') != wanted:
+                self._execute('switchToWindow', {'handle': wanted})
+                self.state['active'] = wanted
+            
+            response = self._execute(driver_command, params)
+            if driver_command == 'closeWindow':
+                self.state['active'] = None
+            return response
+
+class SessionMonitor:
+    """Oturum sağlık monitörü - Bekleme boyunca ucuz periyodik yoklama"""
+    
+    def __init__(self, bot, probe_interval=60, refresh_before=45):
+        self.bot = bot
+        self.probe_interval = probe_interval  # Yoklama aralığı (saniye)
+        self.refresh_before = refresh_before  # Açılıştan kaç saniye önce son kontrol
+        self.last_probe = 0
+        self.last_alive = None
+    
+    def due(self):
+        """Yoklama zamanı geldi mi?"""
+        return (time.time() - self.last_probe) >= self.probe_interval
+    
+    def check(self, target_date_str=None, phase="wait"):
+        """Oturumu yokla, kaybolmuşsa hemen (bekleme fazındayken) yenile"""
+        self.last_probe = time.time()
+        
+        with self.bot.tab_guard():
+            self.last_alive = self.bot.probe_session()
+            
+            if self.last_alive:
+                return True
+            
+            self.last_alive = self.bot.recover_session(phase, target_date_str)
+        return self.last_alive
+    
+    def maybe_check(self, target_date_str=None, phase="wait"):
+        """Zamanı geldiyse yokla"""
+        if self.due():
+            return self.check(target_date_str, phase)
+        return self.last_alive
+    
+    def wait_until(self, deadline, target_date_str=None):
+        """Deadline'a kadar uyu - Arada oturumu sıcak tut"""
+        while True:
+            remaining = (deadline - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return
+            
+            self.maybe_check(target_date_str)
+            
+            next_probe = self.probe_interval - (time.time() - self.last_probe)
+            time.sleep(max(0.05, min(remaining, next_probe)))
+
+# Oturum yoklama - Hafif bir fetch ile login sayfasına yönlendiriliyor muyuz?
+SESSION_PROBE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+fetch(arguments[0], {credentials: 'include', cache: 'no-store'}).then(function(r) {
+    done({status: r.status, url: r.url});
+}).catch(function(e) {
+    done({error: String(e)});
+});
+"""
+
+# Bağlantı ısıtma - Sayfa, asset'ler, hafta ızgarası XHR'ları ve ek sayfalar
+WARMUP_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var pageUrl = arguments[0];
+var extraUrls = arguments.length > 2 ? arguments[1] : [];
+var t0 = performance.now();
+var seen = {};
+var assets = performance.getEntriesByType('resource').filter(function(e) {
+    return ['script', 'link', 'css', 'img'].indexOf(e.initiatorType) !== -1;
+}).map(function(e) { return e.name; }).filter(function(u) {
+    if (seen[u]) { return false; }
+    seen[u] = true;
+    return true;
+}).slice(0, 40);
+// Hafta geçişinde sayfanın yaptığı GET XHR'ları (ızgara verisi) - Aynı origin, cache'siz
+var endpoints = performance.getEntriesByType('resource').filter(function(e) {
+    return ['xmlhttprequest', 'fetch'].indexOf(e.initiatorType) !== -1 && e.name.indexOf(location.origin) === 0;
+}).map(function(e) { return e.name; }).concat(extraUrls).filter(function(u) {
+    if (seen[u]) { return false; }
+    seen[u] = true;
+    return true;
+}).slice(0, 10);
+var finished = false;
+function finish(ok) {
+    if (finished) { return; }
+    finished = true;
+    done({ok: ok, assets: assets.length, endpoints: endpoints.length, ms: Math.round(performance.now() - t0)});
+}
+var requests = [fetch(pageUrl, {credentials: 'include', cache: 'no-store'}).then(function(r) { return r.text(); })];
+endpoints.forEach(function(u) {
+    requests.push(fetch(u, {credentials: 'include', cache: 'no-store'}));
+});
+assets.forEach(function(u) {
+    requests.push(fetch(u, {credentials: 'include', cache: 'force-cache', mode: 'no-cors'}));
+});
+Promise.all(requests.map(function(p) { return p.catch(function() { return null; }); })).then(function() { finish(true); });
+setTimeout(function() { finish(false); }, 8000);
+"""
+
+# Açılış sonrası gerçek bir istek - İlk yoklama sadece DOM okuduysa ölçüm bununla yapılır
+WARMTH_PROBE_SCRIPT = """
+var done = arguments[arguments.length - 1];
+var url = arguments[0];
+fetch(url, {credentials: 'include', cache: 'no-store'}).then(function(r) { return r.text(); }).then(function() {
+    var e = performance.getEntriesByName(url).pop();
+    done(e ? [{
+        name: e.name,
+        dns: Math.round(e.domainLookupEnd - e.domainLookupStart),
+        connect: Math.round(e.connectEnd - e.connectStart),
+        ttfb: Math.round(e.responseStart - e.requestStart)
+    }] : []);
+}).catch(function(e) {
+    done([]);
+});
+"""
+
+# Açılış sonrası ilk yoklamanın sıcak bağlantıdan gelip gelmediğini ölç
+WARMTH_SCRIPT = """
+var since = arguments[0];
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource')).filter(function(e) {
+    return e.name.indexOf(location.origin) === 0 && performance.timeOrigin + e.startTime >= since;
+}).map(function(e) {
+    return {
+        name: e.name,
+        dns: Math.round(e.domainLookupEnd - e.domainLookupStart),
+        connect: Math.round(e.connectEnd - e.connectStart),
+        ttfb: Math.round(e.responseStart - e.requestStart)
+    };
+});
+"""
 
 class DualAttackHalisahaBot:
-    def __init__(self):
+    def __init__(self, target_day=None):
         self.username = os.environ.get('HALISAHA_USERNAME')
         self.password = os.environ.get('HALISAHA_PASSWORD')
-        self.target_day = os.environ.get('TARGET_DAY', 'PAZARTESI')
+        self.target_day = target_day or os.environ.get('TARGET_DAY', 'PAZARTESI')
         
         if not self.username or not self.password:
             raise ValueError("Kullanıcı bilgileri eksik!")
@@ -175,63 +1417,103 @@ class DualAttackHalisahaBot:
         ]
         
         self.driver = None
+        self.trace = RunTrace()
+        self.session_monitor = SessionMonitor(self)
+        self._recovering_session = False
+        
+        # Paylaşılan tarayıcı (scheduler) - Her iş kendi sekmesinde
+        self.tab_handle = None
+        self.tab_lock = None
+        self.tab_state = None
+        self.tab_executor = None
+        self.browser_started = None
+        self.shutdown_event = threading.Event()
+        self.host = None
+        
+        # Varsayılan: global deadline yok - run_dual_attack / scheduler ayarlar
+        self.retry_policy = RetryPolicy()
+        
+        # Çoklu tesis - Her tesis kendi sekmesinde, adaylar tek sırada
+        self.facilities = load_facilities(os.environ.get('TARGET_FACILITIES'),
+                                          self.target_facility_url, self.preferred_hours)
+        self.target_facility_url = self.facilities[0]['url']
+        self.preferred_hours = self.facilities[0]['preferred_hours']
+        self.facility_tabs = []
+        self.active_facility = 0
+        self.reserved_facility = None  # Son tamamlanan rezervasyon akışının tesisi - Rapor e-postaları için
+        
+        # Sıcak yol taşıyıcısı: "webdriver" (klasik) veya "cdp" (kalıcı DevTools soketi)
+        self.transport = os.environ.get('TRANSPORT', 'webdriver').lower()
+        self.cdp = None
+        self.main_handle = None
+        
+        # Oturum cookie cache'i - Geçerliyse login adımı atlanır. Sadece SESSION_CACHE verilirse
+        # (yerel / daemon çalıştırmaları); CI'da cookie'ler cache'e konmaz, her run login yapar
+        self.session_cache_path = os.environ.get('SESSION_CACHE')
+        self.session_cache_max_age = int(os.environ.get('SESSION_CACHE_MAX_AGE', '1800'))
+        
+        # Bootstrap'te açılan SMTP bağlantısı (Future) - send_email bir kez kullanır
+        self.notifier = None
+        self.bootstrap_started = None
+        
+        # Yedek tarayıcı - HOT_SPARE=true ise ana sürücü watchdog altında, yedek hedef haftada bekler
+        self.hot_spare_enabled = os.environ.get('HOT_SPARE', 'false').lower() == 'true'
+        self.watchdog_timeout = float(os.environ.get('WATCHDOG_TIMEOUT', '5'))
+        self.watchdog = None
+        self.spare_future = None
+        self.spare_target = None
+        
+        # Izgara parmak izi cache'i - Değişmeyen yoklamada parse/sıralama/log atlanır
+        self.grid_cache = {}
+        self.unchanged_polls = 0
+        
+        # Saldırı öncesi rezervasyon tablosu - Doğrulama sadece yeni satırlara bakar
+        self.reservation_baseline = None
+        
+        # Offline korpus kaydı - Sadece RECORD_CORPUS=true ise
+        self.corpus = None
+        if os.environ.get('RECORD_CORPUS', 'false').lower() == 'true':
+            self.corpus = CorpusRecorder(os.environ.get('CORPUS_DIR', 'corpus'))
+        
+        # Saldırı döngüsü: "thread" (klasik) veya "asyncio" (orkestratör)
+        self.orchestrator = os.environ.get('ORCHESTRATOR', 'thread').lower()
+        
+        # Yoklama geçmişi - SCAVENGER temposunu belirler
+        self.slot_history = SlotHistoryStore(os.environ.get('SLOT_HISTORY_DIR', 'slot_history'))
+        
+        # Açılıştan kaç saniye önce son ısıtma yapılacak
+        self.warmup_lead_seconds = 5
+        
+        # Açılışa bundan uzaksa hazırlık/bekleme yapılmaz (workflow 12 dk'da kesilir)
+        self.prep_max_lead = timedelta(minutes=10)
         
         logging.info(f"🎯 Dual Attack Bot hazır - Hedef gün: {self.target_day}")
     
-    def calculate_target_date(self):
-        """TARGET_DAY'e göre 1 hafta sonraki tarihi hesapla"""
+    def calculate_target_date(self, target_day=None, now=None):
+        """TARGET_DAY'e göre 1 hafta sonraki tarihi açılış takviminden al"""
         try:
-            today = datetime.now()
-            
-            day_map = {
-                "PAZARTESI": 0, "SALI": 1, "CARSAMBA": 2, "PERSEMBE": 3,
-                "PAZARTESI".lower(): 0, "SALI".lower(): 1, 
-                "CARSAMBA".lower(): 2, "PERSEMBE".lower(): 3
-            }
+            now = now or datetime.now()
+            target_day = (target_day or self.target_day).upper()
             
-            if self.target_day.upper() not in ["PAZARTESI", "SALI", "CARSAMBA", "PERSEMBE"]:
-                logging.error(f"Geçersiz TARGET_DAY: {self.target_day}")
+            if target_day not in DAY_MAP:
+                logging.error(f"Geçersiz TARGET_DAY: {target_day}")
                 return None
             
-            target_weekday = day_map[self.target_day.upper()]
-            current_weekday = today.weekday()
-            
-            # Dual attack için tarih hesaplama
-            current_time = today.time()
-            
-            # Gece yarısından sonra mı kontrol et (23:54-04:00 arası)
-            if current_time.hour >= 23 or current_time.hour <= 4:
-                # Gece yarısı saldırı zamanı
-                # Bir gün önceki akşam mı kontrol et
-                if current_time.hour >= 23:
-                    # 23:54-23:59 arası
-                    yesterday_weekday = current_weekday
-                else:
-                    # 00:00-04:00 arası
-                    yesterday_weekday = (current_weekday - 1) % 7
-                
-                if yesterday_weekday == (target_weekday - 1) % 7:
-                    # Dün hedef günün bir gün öncesiydi, bugün 1 hafta sonraki slot açılıyor
-                    days_ahead = 7
-                else:
-                    # Normal hesaplama
-                    days_to_target = (target_weekday - current_weekday) % 7
-                    if days_to_target == 0:
-                        days_to_target = 7  # Aynı gün ise gelecek hafta
-                    days_ahead = days_to_target + 7  # 1 hafta sonraki
-            else:
-                # Normal zaman
-                days_to_target = (target_weekday - current_weekday) % 7
-                if days_to_target == 0:
-                    days_to_target = 7  # Aynı gün ise gelecek hafta
-                days_ahead = days_to_target + 7  # 1 hafta sonraki
+            # Açılış gecesi (05:00'e kadar) o açılışın hedefi, sonrası bir sonraki açılış
+            entry = get_planner(now).next_opening(target_day, now)
+            if not entry:
+                logging.error(f"❌ Açılış takviminde kayıt yok: {target_day}")
+                return None
             
-            target_date = today + timedelta(days=days_ahead)
+            if entry['holiday']:
+                logging.warning(f"🎌 Hedef gün resmi tatil: {entry['turkish_date']} ({entry['holiday']})")
             
             return {
-                'day_name': self.target_day.upper(),
-                'turkish_date': self.format_turkish_date(target_date),
-                'date_obj': target_date
+                'day_name': target_day,
+                'turkish_date': entry['turkish_date'],
+                'date_obj': datetime.combine(entry['target_date'], datetime.min.time()),
+                'opening': entry['opening_runner'],
+                'holiday': entry['holiday']
             }
         
         except Exception as e:
@@ -240,11 +1522,7 @@ class DualAttackHalisahaBot:
     
     def format_turkish_date(self, date_obj):
         """Türkçe tarih formatı"""
-        month_names = [
-            "", "Ocak", "Şubat", "Mart", "Nisan", "Mayıs", "Haziran",
-            "Temmuz", "Ağustos", "Eylül", "Ekim", "Kasım", "Aralık"
-        ]
-        return f"{date_obj.day} {month_names[date_obj.month]} {date_obj.year}"
+        return format_turkish_date(date_obj)
     
     def setup_driver(self):
         """Driver setup - Session preserved"""
@@ -264,17 +1542,20 @@ class DualAttackHalisahaBot:
             chrome_options.add_argument('--memory-pressure-off')
             
             # SESSION PRESERVATION için ekledik 🔥
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+            chrome_options.add_argument(f'--user-agent={USER_AGENT}')
             chrome_options.add_argument('--disable-blink-features=AutomationControlled')
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
             
             self.driver = webdriver.Chrome(options=chrome_options)
+            if self.hot_spare_enabled:
+                self.watchdog = CommandWatchdog(self.driver, self.watchdog_timeout)
             
-            # Anti-detection
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            # Anti-detection + sayfa içi helper - Her yeni dokümanda otomatik yüklenir
+            self.install_page_helper()
+            self.connect_transport()
             
-            self.driver.set_page_load_timeout(15)
+            self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
             self.driver.implicitly_wait(3)
             
             logging.info("✅ Driver hazır")
@@ -284,18 +1565,104 @@ class DualAttackHalisahaBot:
             logging.error(f"❌ Driver setup hatası: {str(e)}")
             return False
     
-    def login(self):
-        """Login işlemi - Session preserved"""
+    def install_page_helper(self):
+        """Helper kütüphanesini DevTools ile yeni dokümanlara kaydet"""
         try:
-            logging.info("🔐 Giriş işlemi başlatılıyor...")
-            
-            self.driver.get(f"{self.base_url}/giris")
-            time.sleep(3)  # Sayfa yüklenmesi
-            
-            username_field = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.NAME, "username"))
-            )
-            password_field = self.driver.find_element(By.NAME, "password")
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': PAGE_HELPER_JS})
+            logging.info(f"✅ Sayfa helper v{PAGE_HELPER_VERSION} kaydedildi")
+        except Exception as e:
+            # CDP yoksa page_call ilk çağrıda enjekte eder
+            logging.warning(f"⚠️ Helper CDP kaydı başarısız, çağrıda yüklenecek: {e}")
+    
+    def connect_transport(self):
+        """TRANSPORT=cdp ise DevTools soketini hazırla - Olmazsa klasik WebDriver"""
+        if self.cdp is not None:
+            self.cdp.close()
+            self.cdp = None
+        
+        self.main_handle = self.driver.current_window_handle
+        if self.transport != 'cdp':
+            return
+        
+        try:
+            self.cdp = CdpTransport.from_driver(self.driver)
+            self.cdp.subscribe('Page.javascriptDialogOpening',
+                               lambda handle, params: self.trace.event('dialog', message=params.get('message')))
+            logging.info(f"⚡ DevTools taşıyıcısı hazır: {self.cdp.debugger_address}")
+        except CdpTransportError as e:
+            logging.warning(f"⚠️ DevTools taşıyıcısı kullanılamıyor, klasik WebDriver: {e}")
+    
+    def _script_handle(self):
+        """Script'in çalışacağı sekme - Tesis sekmesi, iş sekmesi veya ana sekme"""
+        if self.facility_tabs:
+            return self.facility_tabs[self.active_facility]
+        return self.tab_handle or self.main_handle
+    
+    def run_page_script(self, script, *args):
+        """Sıcak yol script'i - CDP soketi varsa onunla, yoksa/koparsa execute_script"""
+        if self.cdp is not None:
+            try:
+                return self.cdp.evaluate(self._script_handle(), CdpTransport.call_expression(script, args))
+            except CdpTransportError as e:
+                logging.warning(f"⚠️ DevTools çağrısı başarısız, klasik WebDriver: {e}")
+                self.trace.event('transport_fallback', error=str(e))
+        
+        return self.driver.execute_script(script, *args)
+    
+    def page_call(self, name, *args):
+        """Sayfa içi helper fonksiyonunu küçük bir payload ile çağır"""
+        result = self.run_page_script(PAGE_CALL_SCRIPT, PAGE_HELPER_VERSION, name, list(args))
+        
+        if isinstance(result, dict) and result.get('__hsb') == 'missing':
+            # Doküman helper'sız (CDP kaydı öncesi açılmış) - Bir kez yükle
+            self.driver.execute_script(PAGE_HELPER_JS)
+            result = self.run_page_script(PAGE_CALL_SCRIPT, PAGE_HELPER_VERSION, name, list(args))
+            if isinstance(result, dict) and result.get('__hsb') == 'missing':
+                raise PageLayoutError(f"Helper sürümü uyumsuz: beklenen v{PAGE_HELPER_VERSION}, bulunan {result.get('found')}")
+        
+        if isinstance(result, dict) and result.get('__hsb') == 'absent':
+            # Sayfa henüz yüklenmedi veya başka sayfadayız - Geçici DOM hatası gibi davran
+            raise NoSuchElementException(f"{name}: {result.get('missing')} bulunamadı")
+        
+        if isinstance(result, dict) and result.get('__hsb') == 'layout':
+            # Site yapısı değişmiş - Sessizce yanlış veri okumak yerine dur
+            self.trace.event('page_layout_changed', call=name, missing=result.get('missing'))
+            raise PageLayoutError(f"{name}: sayfada beklenen öğeler yok: {result.get('missing')}")
+        
+        return result
+    
+    def page_call_many(self, calls):
+        """Birden çok helper çağrısı [(ad, [argümanlar]), ...] - CDP'de tek pipelined turda
+        
+        Klasik WebDriver'da veya sonuçlardan biri helper işareti taşıyorsa (helper eksik,
+        öğe yok, yapı değişmiş) çağrılar page_call ile sırayla tekrarlanır; hata ve
+        kurtarma davranışı tekil çağrıyla aynı kalır.
+        """
+        if self.cdp is not None:
+            try:
+                expressions = [CdpTransport.call_expression(PAGE_CALL_SCRIPT, (PAGE_HELPER_VERSION, name, list(args)))
+                               for name, args in calls]
+                results = self.cdp.evaluate_many(self._script_handle(), expressions)
+                if not any(isinstance(r, dict) and '__hsb' in r for r in results):
+                    return results
+            except CdpTransportError as e:
+                logging.warning(f"⚠️ DevTools toplu çağrısı başarısız, klasik WebDriver: {e}")
+                self.trace.event('transport_fallback', error=str(e))
+        
+        return [self.page_call(name, *args) for name, args in calls]
+    
+    def login(self):
+        """Login işlemi - Session preserved"""
+        try:
+            logging.info("🔐 Giriş işlemi başlatılıyor...")
+            
+            self.driver.get(f"{self.base_url}/giris")
+            time.sleep(3)  # Sayfa yüklenmesi
+            
+            username_field = WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.NAME, "username"))
+            )
+            password_field = self.driver.find_element(By.NAME, "password")
             
             # Clear ve type et (daha güvenilir)
             username_field.clear()
@@ -340,6 +1707,61 @@ class DualAttackHalisahaBot:
             logging.error(f"❌ Login hatası: {str(e)}")
             return False
     
+    def probe_session(self):
+        """Oturum geçerli mi? - Sayfadan ayrılmadan ucuz kontrol"""
+        try:
+            self.driver.set_script_timeout(10)
+            result = self.driver.execute_async_script(
+                SESSION_PROBE_SCRIPT, f"{self.base_url}/ClubMember/MyReservation.aspx"
+            ) or {}
+            
+            if 'error' in result:
+                # Ağ hatası oturum kaybı değildir
+                logging.warning(f"⚠️ Oturum yoklaması başarısız: {result['error']}")
+                self.trace.event('session_probe', alive=None, error=result['error'])
+                return True
+            
+            alive = result.get('status') == 200 and "giris" not in result.get('url', '')
+            if not alive:
+                logging.warning(f"⚠️ Oturum düşmüş: {result}")
+            self.trace.event('session_probe', alive=alive, status=result.get('status'))
+            return alive
+            
+        except Exception as e:
+            logging.warning(f"⚠️ Oturum yoklama hatası: {e}")
+            self.trace.event('session_probe', alive=None, error=str(e))
+            return True
+    
+    def recover_session(self, phase, target_date_str=None):
+        """Oturumu yenile ve hedef haftaya geri dön"""
+        if self._recovering_session:
+            # İç içe yenileme yok - Login sonrası yine login sayfasına düştük
+            return False
+        
+        self.trace.event('session_lost', phase=phase)
+        logging.warning(f"🔐 Oturum kaybı ({phase}) - Yeniden login yapılıyor...")
+        
+        relogin_start = time.time()
+        self._recovering_session = True
+        try:
+            ok = self.login()
+            if ok:
+                self.driver.get(self.target_facility_url)
+                time.sleep(3)
+                if target_date_str:
+                    ok = self.navigate_to_target_date(target_date_str)
+        finally:
+            self._recovering_session = False
+        
+        elapsed = time.time() - relogin_start
+        self.trace.event('session_relogin', phase=phase, ok=ok, seconds=round(elapsed, 1))
+        
+        if ok:
+            logging.info(f"✅ Oturum yenilendi ({elapsed:.1f}s)")
+        else:
+            logging.error(f"❌ Oturum yenilenemedi ({elapsed:.1f}s)")
+        return ok
+    
     def navigate_to_facility(self):
         """Halısaha sayfasına git - Session aware"""
         try:
@@ -354,9 +1776,14 @@ class DualAttackHalisahaBot:
                 logout_element = self.driver.find_element(By.PARTIAL_LINK_TEXT, "Çıkış")
                 logging.info("✅ Session kontrol OK - Devam ediliyor")
             except:
-                logging.warning("⚠️ Session kontrolü başarısız - Yeniden login deneniyor")
-                if not self.login():
-                    return False
+                # Link yoksa sunucuya sor - Belki sadece header'sız bir sayfadayız
+                if self.probe_session():
+                    logging.info("✅ Session kontrol OK (yoklama) - Devam ediliyor")
+                else:
+                    logging.warning("⚠️ Session kontrolü başarısız - Yeniden login deneniyor")
+                    self.trace.event('session_lost', phase="facility")
+                    if not self.login():
+                        return False
             
             # Facility sayfasına git
             self.driver.get(self.target_facility_url)
@@ -397,8 +1824,9 @@ class DualAttackHalisahaBot:
                 logout_element = self.driver.find_element(By.PARTIAL_LINK_TEXT, "Çıkış")
                 logging.info("✅ Session aktif")
             except:
-                logging.error("❌ Session kaybolmuş!")
-                return
+                if not self.session_monitor.check(phase="test"):
+                    logging.error("❌ Session kaybolmuş!")
+                    return
             
             if not self.navigate_to_target_date(target_date_str):
                 logging.error("❌ Hedef tarihe gidemedi")
@@ -450,96 +1878,290 @@ class DualAttackHalisahaBot:
             logging.error(f"❌ Slot detection test hatası: {e}")
     
     def navigate_to_target_date(self, target_date_str):
-        """Hedef tarihe git - Page recovery added"""
-        try:
-            logging.info(f"🗓️ Hedef tarihe navigasyon: {target_date_str}")
-            
-            # Page recovery - Eğer yanlış sayfadaysak facility'ye dön
-            current_url = self.driver.current_url
-            if "MyReservation" in current_url or "giris" in current_url:
-                logging.info("📍 Yanlış sayfa - Facility'ye dönülüyor...")
-                self.driver.get(self.target_facility_url)
-                time.sleep(5)
-            
-            # Alert handling
-            self.dismiss_alerts()
+        """Hedef tarihe git - Deadline-aware retry ve kurtarma"""
+        policy = self.retry_policy
+        logging.info(f"🗓️ Hedef tarihe navigasyon: {target_date_str}")
+        
+        max_attempts = 15
+        current_attempt = 0
+        
+        while current_attempt < max_attempts:
+            if policy.expired():
+                logging.error("⏰ Global deadline doldu - Navigasyon bırakılıyor")
+                self.trace.event('retry_decision', failure=None, action="give_up", reason="deadline",
+                                 attempt=current_attempt)
+                return False
             
-            # Mevcut tarihi al - Error handling ile
             try:
-                current_date = self.driver.find_element(By.CLASS_NAME, "yonlendirme-info").text
-                logging.info(f"📅 Başlangıç tarih aralığı: {current_date}")
-            except:
-                logging.warning("⚠️ yonlendirme-info bulunamadı - Sayfa yenileniyor...")
-                self.driver.refresh()
-                time.sleep(5)
-                try:
-                    current_date = self.driver.find_element(By.CLASS_NAME, "yonlendirme-info").text
-                    logging.info(f"📅 Refresh sonrası tarih: {current_date}")
-                except:
-                    logging.error("❌ Tarih elementi hala bulunamıyor!")
-                    return False
-            
-            max_attempts = 15
-            current_attempt = 0
-            
-            while current_attempt < max_attempts:
-                try:
-                    # Fresh date check
-                    current_date = self.driver.find_element(By.CLASS_NAME, "yonlendirme-info").text
-                    logging.info(f"📍 Deneme {current_attempt + 1}: Mevcut tarih aralığı: '{current_date}'")
-                    
-                    if not current_date:
-                        logging.warning("⚠️ Tarih bilgisi yok, bekleniyor...")
-                        time.sleep(2)
-                        current_attempt += 1
-                        continue
-                    
-                    # Hedef tarih kontrolü
-                    if is_date_in_range(target_date_str, current_date):
-                        logging.info("✅ HEDEF TARİH BULUNDU! Aralık içinde.")
-                        return True
-                    
-                    # Hangi yöne gidileceğini belirle
-                    direction = get_navigation_direction(target_date_str, current_date)
-                    
-                    if direction == "found":
-                        logging.info("✅ HEDEF TARİH BULUNDU! (Parse kontrolü)")
-                        return True
-                    elif direction == "prev":
-                        logging.info("⬅️ Önceki haftaya geçiliyor...")
-                        button = self.driver.find_element(By.ID, "area-onceki-hafta")
-                        self.driver.execute_script("arguments[0].click();", button)
-                    elif direction == "next":
-                        logging.info("➡️ Sonraki haftaya geçiliyor...")
-                        button = self.driver.find_element(By.ID, "area-sonraki-hafta")
-                        self.driver.execute_script("arguments[0].click();", button)
-                    
-                    time.sleep(3)  # Sayfa yüklenmesi için bekle
+                # Alert handling
+                self.dismiss_alerts()
+                
+                # Page recovery - Yanlış sayfadaysak kurtarma katmanına bırak
+                current_url = self.driver.current_url
+                if "giris" in current_url or "MyReservation" in current_url:
+                    raise PageStateError(f"Yanlış sayfa: {current_url}")
+                
+                # Fresh date check
+                current_date = self.page_call('readRange')
+                logging.info(f"📍 Deneme {current_attempt + 1}: Mevcut tarih aralığı: '{current_date}'")
+                
+                if not current_date:
+                    logging.warning("⚠️ Tarih bilgisi yok, bekleniyor...")
+                    policy.sleep(1)
                     current_attempt += 1
-                    
-                    # Alert check after navigation
+                    continue
+                
+                # Hedef tarih kontrolü
+                if is_date_in_range(target_date_str, current_date):
+                    logging.info("✅ HEDEF TARİH BULUNDU! Aralık içinde.")
+                    return True
+                
+                # Hangi yöne gidileceğini belirle
+                direction = get_navigation_direction(target_date_str, current_date)
+                
+                if direction == "found":
+                    logging.info("✅ HEDEF TARİH BULUNDU! (Parse kontrolü)")
+                    return True
+                elif direction == "prev":
+                    logging.info("⬅️ Önceki haftaya geçiliyor...")
+                    self.page_call('clickNav', "prev")
+                elif direction == "next":
+                    logging.info("➡️ Sonraki haftaya geçiliyor...")
+                    self.page_call('clickNav', "next")
+                
+                current_attempt += 1
+                
+                # Sabit bekleme yerine tarih aralığı değişene kadar (deneme bütçesi kadar) bekle
+                self._wait_for_range_change(current_date, policy.attempt_budget())
+                
+            except Exception as nav_error:
+                logging.error(f"❌ Navigasyon hatası: {nav_error}")
+                current_attempt += 1
+                
+                if not self.handle_failure(nav_error, current_attempt):
+                    return False
+        
+        logging.error(f"❌ {max_attempts} denemede hedef tarihe ulaşılamadı")
+        return False
+    
+    def _wait_for_range_change(self, old_range, timeout):
+        """Hafta değişimini bekle - Değişmezse sonraki deneme tekrar okur"""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2,
+                          ignored_exceptions=(NoSuchElementException,)).until(
+                lambda d: self.page_call('readRange') != old_range
+            )
+        except TimeoutException:
+            logging.warning(f"⚠️ Hafta {timeout:.0f}s içinde değişmedi")
+    
+    def _wait_for_calendar(self):
+        """Takvimin yüklenmesini deneme bütçesi kadar bekle"""
+        try:
+            WebDriverWait(self.driver, self.retry_policy.attempt_budget(), poll_frequency=0.2).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "yonlendirme-info"))
+            )
+        except TimeoutException:
+            logging.warning("⚠️ Takvim deneme bütçesi içinde yüklenmedi")
+    
+    def read_current_url(self):
+        """Kurtarma için mevcut URL - Alert engelliyorsa kapatıp bir kez daha dener
+        
+        Bağlantı kaybı hataları aynen fırlar; diğer hatalarda (alert, geçici sürücü
+        hatası) ikinci denemeden sonra None döner.
+        """
+        for url_attempt in range(2):
+            try:
+                return self.driver.current_url
+            except Exception as e:
+                if is_browser_crash(e):
+                    raise
+                if url_attempt == 0:
                     self.dismiss_alerts()
-                    
-                except Exception as nav_error:
-                    logging.error(f"❌ Navigasyon hatası: {nav_error}")
-                    
-                    # RECOVERY ATTEMPT
-                    logging.info("🔄 Recovery - Facility sayfasına dönülüyor...")
-                    try:
-                        self.driver.get(self.target_facility_url)
-                        time.sleep(5)
-                    except:
-                        logging.error("❌ Recovery başarısız")
-                    
-                    current_attempt += 1
-                    time.sleep(2)
-            
-            logging.error(f"❌ {max_attempts} denemede hedef tarihe ulaşılamadı")
+        return None
+    
+    def handle_failure(self, error, attempt=1):
+        """Hatayı sınıflandır ve en ucuz kurtarmayı uygula - Karar trace'e yazılır
+        
+        Paylaşılan tarayıcıda kurtarma komutları (current_url, refresh, get) işin
+        kendi sekmesinde çalışsın diye tab_guard içinde yürür; çağıranın guard'ı
+        bırakmış olması önemli değildir.
+        """
+        with self.tab_guard():
+            return self._recover(error, attempt)
+    
+    def _recover(self, error, attempt):
+        """handle_failure gövdesi - İşin sekmesine bağlıyken çağrılır"""
+        policy = self.retry_policy
+        
+        try:
+            kind = classify_failure(error, self.read_current_url(), self.base_url)
+        except Exception as url_error:
+            # URL okunurken bağlantı koptu - Tarayıcı gitmiş
+            logging.warning(f"⚠️ URL okunamadı: {url_error}")
+            kind = FAILURE_BROWSER_CRASHED
+        
+        if policy.expired():
+            action = "give_up"
+        elif kind == FAILURE_TRANSIENT_DOM:
+            # Önce sadece bekle, tekrarlarsa yenile, inatçıysa sayfayı baştan yükle
+            action = "wait" if attempt <= 1 else ("refresh" if attempt <= 3 else "reload_facility")
+        elif kind == FAILURE_WRONG_PAGE:
+            action = "reload_facility"
+        elif kind == FAILURE_SESSION_LOST:
+            action = "relogin"
+        else:
+            action = "restart_browser"
+        
+        error_line = (str(error).strip().splitlines() or [type(error).__name__])[0][:200]
+        self.trace.event('retry_decision', failure=kind, action=action, attempt=attempt,
+                         remaining=policy.describe(), error=error_line)
+        logging.info(f"🔄 Kurtarma: {kind} → {action}")
+        
+        if action == "give_up":
             return False
+        
+        try:
+            if action == "wait":
+                policy.sleep(0.5)
+            elif action == "refresh":
+                self.driver.refresh()
+                self._wait_for_calendar()
+            elif action == "reload_facility":
+                self.driver.get(self.target_facility_url)
+                self._wait_for_calendar()
+            elif action == "relogin":
+                return self.recover_session("attack")
+            else:
+                return self.restart_browser()
+            return True
             
         except Exception as e:
-            logging.error(f"❌ Tarih navigasyon genel hatası: {str(e)}")
+            # Kurtarma da hata verdi - Sonraki deneme yeniden sınıflandırır
+            logging.error(f"❌ Kurtarma başarısız ({action}): {e}")
+            self.trace.event('retry_failed', failure=kind, action=action, error=str(e)[:200])
+            return not policy.expired()
+    
+    def restart_browser(self):
+        """Çöken tarayıcıyı yeniden başlat - Çalışma kaybolmaz"""
+        # Eski tesis sekmeleri geçersiz - Sonraki yoklama yeniden açar
+        self.facility_tabs = []
+        self.active_facility = 0
+        self.activate_facility(0)
+        
+        # Hazır yedek varsa yeniden başlatma yerine anında devral
+        if self.promote_hot_spare("çökme/takılma"):
+            return True
+        
+        if self.host is not None:
+            return self.host.reattach_worker(self)
+        if self.tab_lock is not None:
+            return self.restart_shared_browser("çökme")
+        
+        logging.warning("♻️ Tarayıcı çöktü - Yeniden başlatılıyor...")
+        self.trace.event('browser_restart', reason="çökme")
+        
+        try:
+            self.driver.quit()
+        except:
+            pass
+        
+        return self.setup_driver() and self.login() and self.navigate_to_facility()
+    
+    def start_hot_spare(self, target_date_str):
+        """Yedek tarayıcıyı arka planda hazırla - Cookie'ler ana tarayıcıdan, hedef haftada bekler"""
+        if not self.hot_spare_enabled or self.tab_lock is not None:
+            return
+        
+        self.spare_target = target_date_str
+        try:
+            cookies = self.driver.get_cookies()
+        except Exception as e:
+            logging.warning(f"⚠️ Yedek tarayıcı için cookie alınamadı: {e}")
+            return
+        
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="hot-spare")
+        self.spare_future = executor.submit(self._build_hot_spare, cookies, target_date_str)
+        executor.shutdown(wait=False)
+    
+    def _build_hot_spare(self, cookies, target_date_str):
+        started = time.time()
+        spare = DualAttackHalisahaBot(target_day=self.target_day)
+        spare.trace = self.trace
+        spare.retry_policy = self.retry_policy
+        
+        try:
+            if not spare.setup_driver():
+                raise Exception("Driver setup başarısız")
+            if not spare.start_session(cookies):
+                raise Exception("Oturum kurulamadı")
+            if not spare.navigate_to_facility() or not spare.navigate_to_target_date(target_date_str):
+                raise Exception("Hedef haftaya gidilemedi")
+        except Exception as e:
+            logging.warning(f"⚠️ Yedek tarayıcı hazırlanamadı: {e}")
+            self.trace.event('hot_spare', ready=False, error=str(e)[:200])
+            self._discard_driver(spare.driver, spare.watchdog, spare.cdp)
+            raise
+        
+        logging.info(f"🛟 Yedek tarayıcı hazır ({time.time() - started:.1f}s) - {target_date_str}")
+        self.trace.event('hot_spare', ready=True, seconds=round(time.time() - started, 1))
+        return spare
+    
+    def promote_hot_spare(self, reason):
+        """Hazır yedeği ana sürücü yap - Yedek henüz hazır değilse False (klasik yeniden başlatma)"""
+        future = self.spare_future
+        if future is None or not future.done():
             return False
+        
+        self.spare_future = None
+        try:
+            spare = future.result()
+        except Exception:
+            return False
+        
+        started = time.perf_counter()
+        old = (self.driver, self.watchdog, self.cdp)
+        self.driver, self.watchdog = spare.driver, spare.watchdog
+        self.cdp, self.main_handle = spare.cdp, spare.main_handle
+        self.grid_cache = {}
+        
+        # Takılı sürücüyü kapatmak da takılabilir - Arka planda
+        threading.Thread(target=self._discard_driver, args=old, daemon=True).start()
+        
+        ms = (time.perf_counter() - started) * 1000
+        logging.warning(f"🛟 Yedek tarayıcı devreye alındı ({reason}) - {ms:.1f}ms")
+        self.trace.event('hot_spare_promoted', reason=reason, ms=round(ms, 2))
+        
+        # Pencerede süre varsa yeni yedek hazırla
+        if self.retry_policy.remaining() > 120:
+            self.start_hot_spare(self.spare_target)
+        return True
+    
+    def stop_hot_spare(self):
+        """Bekleyen/hazır yedeği kapat"""
+        future, self.spare_future = self.spare_future, None
+        if future is None:
+            return
+        
+        def discard(done):
+            try:
+                spare = done.result()
+                self._discard_driver(spare.driver, spare.watchdog, spare.cdp)
+            except Exception:
+                pass
+        future.add_done_callback(discard)
+    
+    @staticmethod
+    def _discard_driver(driver, watchdog=None, cdp=None):
+        """Sürücüyü kapat - Takılıysa quit hemen düşer, chromedriver servisi yine durdurulur"""
+        if cdp is not None:
+            cdp.close()
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if watchdog is not None:
+            watchdog.close()
     
     def dismiss_alerts(self):
         """Alert/popup'ları temizle"""
@@ -550,6 +2172,23 @@ class DualAttackHalisahaBot:
         except:
             pass
     
+    @contextmanager
+    def tab_guard(self):
+        """Paylaşılan tarayıcıda bu bloğun komutları işin sekmesinde çalışsın - Tek başına çalışırken no-op
+        
+        Kilit blok boyunca tutulmaz; SharedTabExecutor komut başına alır ve
+        gerekiyorsa sekmeye geçer.
+        """
+        if self.tab_executor is None:
+            yield
+            return
+        
+        previous = self.tab_executor.bind(self._script_handle())
+        try:
+            yield
+        finally:
+            self.tab_executor.bind(previous)
+    
     def find_and_reserve_slot(self, target_date_str, attack_mode="WAR_ZONE"):
         """Slot bul ve rezerve et - FULL DEBUG"""
         try:
@@ -559,7 +2198,18 @@ class DualAttackHalisahaBot:
             
             self.dismiss_alerts()
             
-            all_slots = self.driver.find_elements(By.CSS_SELECTOR, "div.lesson.active")
+            # Tek çağrıda tüm haftanın slotları - Izgara değişmediyse önceki sonuç
+            snapshot, grid = self.snapshot_if_changed(target_date_str)
+            rank = lambda snap: rank_slot_candidates(snap['slots'], target_date_str, self.preferred_hours)
+            if snapshot is None:
+                self.record_unchanged(target_date_str, grid)
+                if not self.grid_value(grid, 'candidates', rank):
+                    logging.info(f"🔁 {attack_mode}: Izgara değişmedi, aday yok - İşlem atlandı")
+                    return False
+                snapshot = grid['snapshot']
+            else:
+                grid['hours'] = self.record_observation(target_date_str, snapshot)
+            all_slots = [slot for slot in snapshot['slots'] if slot['active']]
             logging.info(f"📊 Toplam {len(all_slots)} aktif slot bulundu")
             
             # ★★★ FULL DEBUG - TÜM SLOTLARI GÖSTER ★★★
@@ -567,20 +2217,16 @@ class DualAttackHalisahaBot:
             slot_dates = {}
             
             for i, slot in enumerate(all_slots):
-                try:
-                    date = slot.get_attribute("data-dateformatted")
-                    hour = slot.get_attribute("data-hour") 
-                    
-                    if date not in slot_dates:
-                        slot_dates[date] = []
-                    slot_dates[date].append(hour)
-                    
-                    # İlk 25 slotu detaylı göster
-                    if i < 25:
-                        logging.info(f"   {i+1:2d}. {date} - {hour}")
-                        
-                except Exception as e:
-                    logging.error(f"   {i+1:2d}. Slot okuma hatası: {e}")
+                date = slot['date']
+                hour = slot['hour']
+                
+                if date not in slot_dates:
+                    slot_dates[date] = []
+                slot_dates[date].append(hour)
+                
+                # İlk 25 slotu detaylı göster
+                if i < 25:
+                    logging.info(f"   {i+1:2d}. {date} - {hour}")
             
             # Tarih bazında özet
             logging.info("📅 *** TARİH ÖZETİ ***")
@@ -598,101 +2244,80 @@ class DualAttackHalisahaBot:
                 logging.error(f"❌ {target_date_str} tarihinde HİÇ SLOT YOK!")
                 logging.info(f"   Mevcut tarihler: {sorted(slot_dates.keys())}")
             
-            # Hedef slotu ara
-            target_slot = None
-            found_hour = None
-            
-            for test_hour in self.preferred_hours:
-                logging.info(f"   🕐 Aranan saat: {test_hour}")
-                for slot in all_slots:
-                    try:
-                        date = slot.get_attribute("data-dateformatted")
-                        hour = slot.get_attribute("data-hour")
-                        
-                        if date == target_date_str and hour == test_hour:
-                            target_slot = slot
-                            found_hour = hour
-                            logging.info(f"🎯 {mode_emoji} HEDEF SLOT BULUNDU: {date} - {hour}")
-                            break
-                    except:
-                        continue
-                
-                if target_slot:
-                    break
+            # Hedef slotu ara - Tercih sırasına göre
+            candidates = self.grid_value(grid, 'candidates', rank)
             
-            if not target_slot:
+            if not candidates:
                 logging.error(f"❌ {attack_mode}: Prime time slot bulunamadı: {target_date_str}")
                 return False
             
-            # REZERVASYON İŞLEMİ - ESKİ KOD AYNI KALACAK
+            found_hour = candidates[0]
+            logging.info(f"🎯 {mode_emoji} HEDEF SLOT BULUNDU: {target_date_str} - {found_hour}")
+            
+            # REZERVASYON İŞLEMİ
             logging.info(f"✅ {mode_emoji} Slot bulundu, rezervasyon işlemi başlatılıyor...")
             logging.info(f"📍 Slot detayı: {target_date_str} - {found_hour}")
             
-            # Slot seçimi
-            self.driver.execute_script("arguments[0].scrollIntoView(true);", target_slot)
-            time.sleep(0.5)
-            self.driver.execute_script("arguments[0].click();", target_slot)
-            logging.info("✅ Slot tıklandı")
+            if not self.attempt_reservation(target_date_str, found_hour, attack_mode):
+                return False
             
-            # Pop-up işlemleri
-            try:
-                # Pop-up'ın yüklenmesini bekle
-                popup = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "bootbox"))
-                )
-                logging.info("✅ Pop-up yüklendi")
-                
-                # Rezerve Et seçeneğini bul
-                rezerve_radio = popup.find_element(By.CSS_SELECTOR, "input[value='basvuru-yap']")
-                self.driver.execute_script("arguments[0].click();", rezerve_radio)
-                logging.info("✅ Rezerve Et seçeneği seçildi")
-                
-                # Devam butonunu bul ve tıkla
-                devam_button = popup.find_element(By.CSS_SELECTOR, "button.btn.btn-blue.devam-et")
-                self.driver.execute_script("arguments[0].click();", devam_button)
-                logging.info("✅ Devam butonuna tıklandı")
-                
-                # İkinci pop-up için bekle
-                time.sleep(2)
-                
-                # Rezervasyon kuralları checkbox'ını bul
-                rules_checkbox = self.driver.find_element(By.CSS_SELECTOR, "input[type='checkbox']")
-                self.driver.execute_script("arguments[0].click();", rules_checkbox)
-                logging.info("✅ Rezervasyon kuralları kabul edildi")
-                
-                # Evet butonunu bul ve tıkla
-                self.driver.execute_script("""
-                    var buttons = document.querySelectorAll('button.btn.btn-blue');
-                    for(var i=0; i<buttons.length; i++) {
-                        if(buttons[i].textContent.trim() === 'Evet') {
-                            buttons[i].click();
-                            return true;
-                        }
-                    }
-                """)
-                logging.info("✅ Final 'Evet' butonu tıklandı")
-                
-                # Tıklama sonrası bekle
-                time.sleep(5)
-                
-                # Rezervasyon kontrolü
-                success = self.check_reservation_success(target_date_str, found_hour)
-                
-                if success:
-                    logging.info(f"🎉 ✅ {mode_emoji} REZERVASYON BAŞARIYLA TAMAMLANDI!")
-                    return True
-                else:
-                    logging.error(f"❌ {attack_mode}: Rezervasyon tamamlanamadı veya doğrulanamadı!")
-                    return False
-                    
-            except Exception as popup_error:
-                logging.error(f"❌ {attack_mode}: Pop-up işlemlerinde hata: {str(popup_error)}")
+            # Tıklama sonrası bekle
+            time.sleep(5)
+            
+            # Rezervasyon kontrolü
+            success = self.check_reservation_success(target_date_str, found_hour)
+            
+            if success:
+                logging.info(f"🎉 ✅ {mode_emoji} REZERVASYON BAŞARIYLA TAMAMLANDI!")
+                return True
+            else:
+                logging.error(f"❌ {attack_mode}: Rezervasyon tamamlanamadı veya doğrulanamadı!")
                 return False
             
         except Exception as e:
             logging.error(f"❌ {attack_mode}: Slot bulma/rezervasyon genel hatası: {str(e)}")
             return False
     
+    def attempt_reservation(self, target_date_str, hour, attack_mode="WAR_ZONE"):
+        """Slotu tıkla ve pop-up adımlarını tamamla - Doğrulama yapmaz
+        
+        Tarayıcı düzeyindeki hatalar (takılma, oturum kaybı) çağırana iletilir ki
+        kurtarma yapılabilsin; sayfa hataları False döner.
+        """
+        try:
+            # Slot seçimi
+            if not self.page_call('clickSlot', target_date_str, hour):
+                logging.error(f"❌ {attack_mode}: Slot tıklanamadı (kapılmış olabilir)")
+                return False
+            logging.info("✅ Slot tıklandı")
+            
+            # Pop-up'ın yüklenmesini bekle
+            WebDriverWait(self.driver, 10).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "bootbox"))
+            )
+            logging.info("✅ Pop-up yüklendi")
+            
+            # Rezerve Et seçeneği + Devam butonu
+            if not self.page_call('startReservation'):
+                raise Exception("Rezerve Et / Devam seçilemedi")
+            logging.info("✅ Rezerve Et seçildi, Devam butonuna tıklandı")
+            
+            # İkinci pop-up için bekle
+            time.sleep(2)
+            
+            # Rezervasyon kuralları checkbox'ı + Evet butonu
+            if not self.page_call('confirmReservation'):
+                raise Exception("Kurallar / Evet onaylanamadı")
+            logging.info("✅ Rezervasyon kuralları kabul edildi, final 'Evet' butonu tıklandı")
+            self.reserved_facility = self.facilities[self.active_facility]['name']
+            return True
+            
+        except (BrowserStalledError, InvalidSessionIdException):
+            raise
+        except Exception as popup_error:
+            logging.error(f"❌ {attack_mode}: Slot / pop-up işlemlerinde hata: {str(popup_error)}")
+            return False
+    
     def check_reservation_success(self, target_date_str, target_hour):
         """Rezervasyonun başarılı olup olmadığını kontrol et - FIXED"""
         try:
@@ -700,41 +2325,30 @@ class DualAttackHalisahaBot:
             
             # Rezervasyonlarım sayfasına git
             self.driver.get(f"{self.base_url}/ClubMember/MyReservation.aspx")
-            time.sleep(3)
             
-            # Tablodaki tüm satırları bul
-            rows = self.driver.find_elements(By.CSS_SELECTOR, "#AreaReservationTable tbody tr")
+            # Tablo gelir gelmez devam et
+            WebDriverWait(self.driver, 5, poll_frequency=0.2, ignored_exceptions=(NoSuchElementException,)).until(
+                lambda d: (self.page_call('readReservations'),)
+            )
+            
+            # Satırlar baseline ile aynı çıkarıcıdan - innerText/HTML farkı eski satırı "yeni" göstermesin
+            rows = parse_reservation_rows(self.driver.page_source)
             logging.info(f"📊 Tabloda {len(rows)} satır bulundu")
             
-            # Saat formatını düzenle (TARİH KONTROLÜ YOK!)
-            check_hour = target_hour.replace("/", " - ") if target_hour else ""
+            if self.corpus:
+                self.record_corpus_page('reservations', target_date_str, {'rows': rows, 'hour': target_hour})
             
-            logging.info(f"🔍 Aranan saat: {check_hour}")
+            for i, cells in enumerate(rows):
+                logging.info(f"📋 Satır {i+1}: {' | '.join(cells[:3])}")
             
-            # Her satırı kontrol et
-            for i, row in enumerate(rows):
-                try:
-                    cells = row.find_elements(By.TAG_NAME, "td")
-                    if len(cells) >= 3:  # En az 3 kolon: [Tesis], [Saat], [Durum]
-                        facility_cell = cells[0].text if len(cells) > 0 else ""
-                        hour_cell = cells[1].text if len(cells) > 1 else ""
-                        status = cells[2].text if len(cells) > 2 else ""
-                        
-                        logging.info(f"📋 Satır {i+1}: {facility_cell} | {hour_cell} | {status}")
-                        
-                        # SADECE SAAT KONTROLÜ (tarih yok çünkü tabloda tarih kolonu yok!)
-                        hour_match = check_hour in hour_cell if check_hour else True
-                        
-                        if hour_match and ("Ön Onaylı" in status or "Onaylı" in status):
-                            logging.info(f"✅ REZERVASYON BAŞARILI!")
-                            logging.info(f"   Tesis: {facility_cell}")
-                            logging.info(f"   Saat: {hour_cell}")
-                            logging.info(f"   Durum: {status}")
-                            return True
-                            
-                except Exception as row_error:
-                    logging.error(f"⚠️ Satır {i+1} okuma hatası: {str(row_error)}")
-                    continue
+            # Tabloda tarih kolonu yok - Saat eşleşmesi sadece baseline'dan sonra gelen satırlarda
+            match = self.match_new_reservation(rows, target_hour)
+            if match:
+                logging.info(f"✅ REZERVASYON BAŞARILI!")
+                logging.info(f"   Tesis: {match[0]}")
+                logging.info(f"   Saat: {match[1]}")
+                logging.info(f"   Durum: {match[2]}")
+                return True
             
             return False
             
@@ -742,6 +2356,58 @@ class DualAttackHalisahaBot:
             logging.error(f"❌ Rezervasyon kontrolü hatası: {str(e)}")
             return False
     
+    def capture_reservation_baseline(self):
+        """Saldırı penceresinden önce mevcut rezervasyonları kaydet - HTTP ile, sekme yerinde kalır"""
+        try:
+            with self.tab_guard():
+                cookies = self.driver.get_cookies()
+            self.reservation_baseline = self.fetch_reservation_rows_http(cookies)
+            
+            logging.info(f"📒 Rezervasyon baseline'ı: {len(self.reservation_baseline)} mevcut satır")
+            for cells in self.reservation_baseline:
+                logging.info(f"   📒 {' | '.join(cells[:3])}")
+            self.trace.event('reservation_baseline', rows=len(self.reservation_baseline))
+            return True
+        except Exception as e:
+            logging.warning(f"⚠️ Rezervasyon baseline'ı alınamadı, doğrulama saat eşleşmesine döner: {e}")
+            self.reservation_baseline = None
+            return False
+    
+    def match_new_reservation(self, rows, target_hour):
+        """Baseline'da olmayan onaylı satırı bul - Baseline yoksa eski saat eşleştirmesi"""
+        if self.reservation_baseline is None:
+            logging.warning("⚠️ Baseline yok - Aynı saatteki eski rezervasyon da başarı sayılabilir")
+            return match_reservation_row(rows, target_hour)
+        
+        fresh = diff_reservation_rows(self.reservation_baseline, rows)
+        if fresh:
+            logging.info(f"🆕 Baseline'a göre {len(fresh)} yeni satır")
+        return match_reservation_row(fresh, target_hour)
+    
+    def connect_notifier(self):
+        """SMTP bağlantısını kur ve giriş yap - E-posta bilgisi yoksa None"""
+        email = os.environ.get('NOTIFICATION_EMAIL')
+        password = os.environ.get('EMAIL_PASSWORD')
+        if not email or not password:
+            return None
+        
+        server = smtplib.SMTP('smtp.gmail.com', 587, timeout=15)
+        server.starttls()
+        server.login(email, password)
+        return server
+    
+    def _pooled_notifier(self):
+        """Bootstrap'te kurulan SMTP bağlantısını al (tek kullanımlık) - Yoksa None"""
+        future, self.notifier = self.notifier, None
+        if future is None:
+            return None
+        
+        try:
+            return future.result(timeout=15)
+        except Exception as e:
+            logging.warning(f"⚠️ Hazır SMTP bağlantısı kullanılamıyor: {e}")
+            return None
+    
     def send_email(self, subject, message):
         """Email gönder"""
         try:
@@ -758,52 +2424,148 @@ class DualAttackHalisahaBot:
             msg['Subject'] = subject
             msg.attach(MIMEText(message, 'plain', 'utf-8'))
             
-            server = smtplib.SMTP('smtp.gmail.com', 587)
-            server.starttls()
-            server.login(email, password)
-            server.send_message(msg)
+            server = self._pooled_notifier()
+            if server is not None:
+                try:
+                    server.send_message(msg)
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    # Bekleme boyunca sunucu boştaki bağlantıyı kapatmış olabilir - Soket sızmasın
+                    try:
+                        server.close()
+                    except Exception:
+                        pass
+                    server = None
+            
+            if server is None:
+                server = self.connect_notifier()
+                server.send_message(msg)
             server.quit()
             
             logging.info(f"📧 E-posta gönderildi: {subject}")
         except Exception as e:
             logging.error(f"E-posta hatası: {str(e)}")
     
-    def wait_for_slots_to_open(self, target_date_str, max_wait_minutes=10):
-        """Slotların açılmasını bekle - İyileştirilmiş"""
+    def warm_up_connections(self, phase):
+        """Bağlantıları sıcak tut - Sayfa ve popup asset'lerini cache'e çek"""
         try:
-            logging.info(f"⏳ {target_date_str} slotlarının açılması bekleniyor...")
+            logging.info(f"🔥 Warm-up ({phase}) başlatılıyor...")
             
-            wait_start = time.time()
-            max_wait_seconds = max_wait_minutes * 60
-            check_interval = 15  # 15 saniye (daha sık kontrol)
+            self.driver.set_script_timeout(10)
+            # Doğrulamanın gideceği rezervasyon sayfası da ısıtılır
+            extra_urls = [f"{self.base_url}/ClubMember/MyReservation.aspx"]
+            result = self.driver.execute_async_script(WARMUP_SCRIPT, self.target_facility_url, extra_urls) or {}
             
-            while (time.time() - wait_start) < max_wait_seconds:
-                current_time = datetime.now()
-                
-                # Hedef tarihe git
-                if self.navigate_to_target_date(target_date_str):
-                    # Slotları kontrol et
-                    all_slots = self.driver.find_elements(By.CSS_SELECTOR, "div.lesson.active")
-                    target_date_slots = []
-                    
-                    for slot in all_slots:
-                        try:
-                            date = slot.get_attribute("data-dateformatted")
-                            if date == target_date_str:
-                                target_date_slots.append(slot)
-                        except:
-                            continue
-                    
-                    if len(target_date_slots) > 0:
-                        logging.info(f"🎉 {target_date_str} slotları açıldı! {len(target_date_slots)} slot bulundu")
-                        return True
-                    else:
-                        elapsed = int(time.time() - wait_start)
-                        logging.info(f"⏳ {current_time.strftime('%H:%M:%S')} - Henüz slot yok. Bekleniyor... ({elapsed}s)")
-                        time.sleep(check_interval)
-                else:
-                    logging.warning("⚠️ Hedef tarihe gidilemedi, tekrar deneniyor...")
-                    time.sleep(check_interval // 2)  # Daha hızlı retry
+            logging.info(f"✅ Warm-up ({phase}): {result.get('assets', 0)} asset, "
+                         f"{result.get('endpoints', 0)} endpoint, {result.get('ms', 0)}ms")
+            self.trace.event('warmup', phase=phase, ok=result.get('ok', False), assets=result.get('assets', 0),
+                             endpoints=result.get('endpoints', 0), ms=result.get('ms', 0))
+            return bool(result.get('ok'))
+            
+        except Exception as e:
+            logging.warning(f"⚠️ Warm-up ({phase}) hatası: {e}")
+            self.trace.event('warmup', phase=phase, ok=False, error=str(e))
+            return False
+    
+    def report_poll_warmth(self, since, probe=False):
+        """Açılış sonrası ilk istek sıcak bağlantıdan mı geldi? - True/False, ölçülemezse None
+        
+        İlk yoklama sadece DOM okuduysa (hiç istek yok) ve probe=True ise gerçek bir
+        istek atılıp o ölçülür; örnek yoksa sonuç "bilinmiyor"dur, sıcak sayılmaz.
+        """
+        try:
+            since_ms = since.timestamp() * 1000
+            entries = self.driver.execute_script(WARMTH_SCRIPT, since_ms) or []
+            source = "poll"
+            if not entries and probe:
+                self.driver.set_script_timeout(5)
+                entries = self.driver.execute_async_script(WARMTH_PROBE_SCRIPT, self.target_facility_url) or []
+                source = "probe"
+            
+            if not entries:
+                logging.info("❔ İlk açılış yoklaması ağ isteği yapmadı - Bağlantı sıcaklığı bilinmiyor")
+                self.trace.event('first_poll_warmth', warm=None, requests=0, source=source)
+                return None
+            
+            cold = [e for e in entries if e['dns'] > 0 or e['connect'] > 0]
+            warm = len(cold) == 0
+            
+            if warm:
+                logging.info(f"🔥 İlk açılış yoklaması SICAK ({len(entries)} istek)")
+            else:
+                logging.warning(f"🧊 İlk açılış yoklaması SOĞUK: {len(cold)}/{len(entries)} istek yeni bağlantı açtı")
+            
+            self.trace.event('first_poll_warmth', warm=warm, requests=len(entries), source=source,
+                             cold_requests=len(cold), entries=entries[:10])
+            return warm
+            
+        except Exception as e:
+            logging.warning(f"⚠️ Sıcaklık ölçüm hatası: {e}")
+            self.trace.event('first_poll_warmth', warm=None, error=str(e))
+            return None
+    
+    def wait_for_slots_to_open(self, target_date_str, max_wait_minutes=10, opening_instant=None):
+        """Slotların açılmasını bekle - İyileştirilmiş"""
+        try:
+            logging.info(f"⏳ {target_date_str} slotlarının açılması bekleniyor...")
+            
+            wait_start = time.time()
+            max_wait_seconds = max_wait_minutes * 60
+            check_interval = 15  # 15 saniye (daha sık kontrol)
+            
+            # Açılış anı biliniyorsa son ısıtmayı ve ilk yoklamayı ona göre ayarla
+            final_warmup_done = opening_instant is None
+            warmth_reported = opening_instant is None
+            session_refreshed = opening_instant is None
+            poll_failures = 0  # Art arda hatalı yoklama - Kurtarma adımı buna göre tırmanır
+            
+            while (time.time() - wait_start) < max_wait_seconds and not self.retry_policy.expired():
+                current_time = datetime.now()
+                
+                if not final_warmup_done:
+                    until_open = (opening_instant - current_time).total_seconds()
+                    if not session_refreshed and until_open <= self.session_monitor.refresh_before:
+                        # Açılıştan önce oturumu son kez doğrula - Login burst'e kalmasın
+                        self.session_monitor.check(target_date_str, phase="pre-open")
+                        session_refreshed = True
+                    else:
+                        self.session_monitor.maybe_check(target_date_str)
+                    
+                    if until_open <= self.warmup_lead_seconds:
+                        # Açılıştan saniyeler önce son ısıtma, sonra tam açılış anında yokla
+                        with self.tab_guard():
+                            self.warm_up_connections("pre-open")
+                        final_warmup_done = True
+                        remaining = (opening_instant - datetime.now()).total_seconds()
+                        if remaining > 0:
+                            time.sleep(remaining)
+                        current_time = datetime.now()
+                
+                # Hedef tarihe git ve slotları say
+                try:
+                    with self.tab_guard():
+                        slot_count = self._count_target_slots(target_date_str)
+                        if slot_count is not None and not warmth_reported and current_time >= opening_instant:
+                            # Slot yoksa zaten beklenecek - Ölçüm isteği saldırıyı geciktirmez
+                            self.report_poll_warmth(opening_instant, probe=slot_count == 0)
+                            warmth_reported = True
+                except Exception as poll_error:
+                    poll_failures += 1
+                    if not self.handle_failure(poll_error, poll_failures):
+                        return False
+                    continue
+                poll_failures = 0
+                
+                if slot_count is not None:
+                    if slot_count > 0:
+                        logging.info(f"🎉 {target_date_str} slotları açıldı! {slot_count} slot bulundu")
+                        return True
+                    else:
+                        elapsed = int(time.time() - wait_start)
+                        logging.info(f"⏳ {current_time.strftime('%H:%M:%S')} - Henüz slot yok. Bekleniyor... ({elapsed}s)")
+                        time.sleep(self._next_poll_delay(check_interval, opening_instant, final_warmup_done))
+                else:
+                    logging.warning("⚠️ Hedef tarihe gidilemedi, tekrar deneniyor...")
+                    time.sleep(check_interval // 2)  # Daha hızlı retry
             
             logging.warning(f"⏰ {max_wait_minutes} dakika beklendi, slotlar açılmadı")
             return False
@@ -811,37 +2573,345 @@ class DualAttackHalisahaBot:
         except Exception as e:
             logging.error(f"❌ Slot bekleme hatası: {e}")
             return False
-    def run_war_zone_attack(self, target):
-        """WAR ZONE saldırısı - 23:56'dan itibaren slot kontrolü"""
-        logging.info("🔥 WAR ZONE ATTACK BAŞLADI!")
+    
+    def poll_candidates(self, target_date_str):
+        """Tek yoklama - Tüm tesislerde hedef haftayı oku, adayları global sırayla döndür
+
+        Aday: {'facility': tesis indeksi, 'hour': saat}. Hiçbir tesis okunamazsa None.
+        """
+        if len(self.facilities) < 2:
+            snapshot, grid = self.snapshot_target_week(target_date_str, only_date=target_date_str)
+            if grid is None:
+                return None
+            if snapshot is None:
+                self.record_unchanged(target_date_str, grid)
+            else:
+                grid['hours'] = self.record_observation(target_date_str, snapshot, only_date=target_date_str)
+            return self.grid_value(grid, 'facility_candidates', lambda snap: [
+                {'facility': 0, 'hour': hour}
+                for hour in rank_slot_candidates(snap['slots'], target_date_str, self.preferred_hours)])
+        
+        self.open_facility_tabs()
+        snapshots = []
+        try:
+            for index, facility in enumerate(self.facilities):
+                self.activate_facility(index)
+                snapshot, grid = self.snapshot_target_week(target_date_str, only_date=target_date_str)
+                if grid is None:
+                    logging.warning(f"⚠️ {facility['name']}: hedef haftaya gidilemedi")
+                    snapshots.append(None)
+                    continue
+                
+                if snapshot is None:
+                    self.record_unchanged(target_date_str, grid)
+                elif index == 0:
+                    # Geçmiş deposu ana tesisin temposunu tutar
+                    grid['hours'] = self.record_observation(target_date_str, snapshot, only_date=target_date_str)
+                snapshots.append(grid['snapshot']['slots'])
+        finally:
+            self.activate_facility(0)
+        
+        if all(slots is None for slots in snapshots):
+            return None
+        return rank_facility_candidates(snapshots, target_date_str, self.facilities)
+    
+    def open_facility_tabs(self):
+        """Ek tesisler için sekme aç - Ana sekme ilk tesise aittir"""
+        if len(self.facilities) < 2 or self.facility_tabs:
+            return
+        
+        primary = self.driver.current_window_handle
+        self.facility_tabs = [primary]
+        
+        for facility in self.facilities[1:]:
+            self.driver.switch_to.new_window('tab')
+            self.facility_tabs.append(self.driver.current_window_handle)
+            self.driver.get(facility['url'])
+            logging.info(f"🗂️ Tesis sekmesi açıldı: {facility['name']}")
+        
+        self.driver.switch_to.window(primary)
+        self.active_facility = 0
+        self.trace.event('facility_tabs', facilities=[f['name'] for f in self.facilities])
+    
+    def activate_facility(self, index):
+        """Tesisin sekmesine geç - Kurtarma akışları bu tesisin URL'ini kullanır"""
+        facility = self.facilities[index]
+        self.target_facility_url = facility['url']
+        self.preferred_hours = facility['preferred_hours']
+        
+        if not self.facility_tabs or index == self.active_facility:
+            return
+        
+        self.driver.switch_to.window(self.facility_tabs[index])
+        self.active_facility = index
+    
+    def close_facility_tabs(self):
+        """Ek tesis sekmelerini kapat, ana sekmeye dön"""
+        if not self.facility_tabs:
+            return
+        
+        try:
+            for handle in self.facility_tabs[1:]:
+                if self.cdp is not None:
+                    self.cdp.forget(handle)
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(self.facility_tabs[0])
+        except Exception as e:
+            logging.warning(f"⚠️ Tesis sekmeleri kapatılamadı: {e}")
+        
+        self.facility_tabs = []
+        self.active_facility = 0
+        self.activate_facility(0)
+    
+    def reserve_candidate(self, target_date_str, candidate, attack_mode):
+        """Adayın tesis sekmesinde rezervasyon akışını çalıştır"""
+        facility = self.facilities[candidate['facility']]
+        logging.info(f"🏟️ {attack_mode}: {facility['name']} - {target_date_str} - {candidate['hour']}")
+        
+        try:
+            self.activate_facility(candidate['facility'])
+            return self.attempt_reservation(target_date_str, candidate['hour'], attack_mode)
+        finally:
+            self.activate_facility(0)
+    
+    def find_and_reserve_best(self, target_date_str, attack_mode="WAR_ZONE"):
+        """Tüm tesisleri tara, global en iyi adayda rezervasyon yap ve doğrula"""
+        mode_emoji = "🔥" if attack_mode == "WAR_ZONE" else "🌙"
+        
+        try:
+            candidates = self.poll_candidates(target_date_str)
+            if not candidates:
+                logging.error(f"❌ {attack_mode}: Hiçbir tesiste prime time slot yok: {target_date_str}")
+                return False
+            
+            summary = ", ".join(f"{self.facilities[c['facility']]['name']} {c['hour']}" for c in candidates[:5])
+            logging.info(f"📋 {mode_emoji} Global aday sırası: {summary}")
+            
+            best = candidates[0]
+            self.trace.event('facility_choice', facility=self.facilities[best['facility']]['name'],
+                             hour=best['hour'], candidates=len(candidates))
+            
+            if not self.reserve_candidate(target_date_str, best, attack_mode):
+                return False
+            
+            # Tıklama sonrası bekle
+            time.sleep(5)
+            
+            if self.check_reservation_success(target_date_str, best['hour']):
+                logging.info(f"🎉 ✅ {mode_emoji} REZERVASYON BAŞARIYLA TAMAMLANDI: {self.facilities[best['facility']]['name']}")
+                return True
+            
+            logging.error(f"❌ {attack_mode}: Rezervasyon tamamlanamadı veya doğrulanamadı!")
+            return False
+            
+        except Exception as e:
+            logging.error(f"❌ {attack_mode}: Çoklu tesis tarama hatası: {e}")
+            return False
+    
+    def attack_once(self, target_date_str, attack_mode):
+        """Tek saldırı turu - Tek tesiste klasik akış, çoklu tesiste global en iyi aday"""
+        if len(self.facilities) > 1:
+            return self.find_and_reserve_best(target_date_str, attack_mode)
+        return (self.navigate_to_target_date(target_date_str) and
+                self.find_and_reserve_slot(target_date_str, attack_mode))
+    
+    def record_corpus_page(self, kind, target_date_str, expected):
+        """Mevcut sayfanın HTML'ini beklenen sonuçla birlikte korpusa kaydet"""
+        try:
+            html = self.driver.execute_script("return document.documentElement.outerHTML")
+            entry = self.corpus.record(kind, html, target_date_str, self.driver.current_url, expected)
+            if entry:
+                logging.info(f"💾 Korpus kaydı: {entry['file']}")
+        except Exception as e:
+            logging.warning(f"⚠️ Korpus kaydı başarısız: {e}")
+    
+    def fetch_reservation_rows_http(self, cookies):
+        """Rezervasyon tablosunu tarayıcıyı meşgul etmeden HTTP ile oku"""
+        cookie_header = "; ".join(f"{c['name']}={c['value']}" for c in cookies)
+        request = urllib.request.Request(
+            f"{self.base_url}/ClubMember/MyReservation.aspx",
+            headers={'Cookie': cookie_header, 'User-Agent': USER_AGENT}
+        )
+        
+        with urllib.request.urlopen(request, timeout=10) as response:
+            final_url = response.geturl()
+            html = response.read().decode('utf-8', errors='replace')
+        
+        if "giris" in final_url:
+            raise PageStateError("Oturum yok - Login sayfasına yönlendirildi")
+        return parse_reservation_rows(html)
+    
+    def _count_target_slots(self, target_date_str):
+        """Hedef haftaya git ve hedef tarihteki aktif slotları say - Gidilemezse None"""
+        snapshot, grid = self.snapshot_target_week(target_date_str, only_date=target_date_str)
+        if grid is None:
+            return None
+        if snapshot is None:
+            self.record_unchanged(target_date_str, grid)
+        else:
+            grid['hours'] = self.record_observation(target_date_str, snapshot, only_date=target_date_str)
+        return self.grid_value(grid, 'count', lambda snap: sum(1 for slot in snap['slots'] if slot['active']))
+    
+    def snapshot_target_week(self, target_date_str, only_date=None):
+        """Hedef haftanın ızgarası - (snapshot | None, cache kaydı); hedef haftaya gidilemezse (None, None)
+        
+        CDP taşıyıcısında aralık okuma ve parmak izli snapshot tek pipelined turda
+        gider: sayfa zaten hedef haftadaysa (patlama sırasındaki her yoklama) ayrı
+        navigasyon turu yapılmaz. Değilse klasik navigasyon + snapshot.
+        """
+        if self.cdp is not None:
+            self.dismiss_alerts()
+            grid = self.grid_cache.get((self.target_facility_url, target_date_str, only_date))
+            try:
+                current_range, result = self.page_call_many([
+                    ('readRange', []),
+                    ('snapshotIfChanged', [grid['fingerprint'] if grid else None, only_date]),
+                ])
+            except (NoSuchElementException, UnexpectedAlertPresentException):
+                # Dialog taşıyıcıda kapatıldı - Klasik navigasyon sayfayı doğrular
+                current_range = None
+            
+            if current_range and is_date_in_range(target_date_str, current_range):
+                return self.snapshot_if_changed(target_date_str, only_date, result=result)
         
+        if not self.navigate_to_target_date(target_date_str):
+            return None, None
+        return self.snapshot_if_changed(target_date_str, only_date)
+    
+    def snapshot_if_changed(self, target_date_str, only_date=None, result=None):
+        """Izgarayı parmak iziyle oku - (snapshot, cache kaydı); değişmediyse snapshot None
+        
+        Cache kaydı tesis + hedef + kapsam başına tutulur ve son snapshot'ı saklar. Aynı
+        kaydı birden çok çağıran paylaşır (sayım, yoklama, arama); türetilmiş sonuçlar
+        grid_value ile alınır, kayıtta yoksa snapshot'tan yeniden hesaplanır.
+        """
+        key = (self.target_facility_url, target_date_str, only_date)
+        grid = self.grid_cache.get(key)
+        
+        if result is None:
+            result = self.page_call('snapshotIfChanged', grid['fingerprint'] if grid else None, only_date)
+        if result.get('unchanged'):
+            self.unchanged_polls += 1
+            return None, grid
+        
+        if grid is not None:
+            logging.info(f"🔀 Izgara değişti ({self.unchanged_polls} değişmeyen yoklamadan sonra)")
+            self.trace.event('grid_changed', target=target_date_str, unchanged_polls=self.unchanged_polls)
+        self.unchanged_polls = 0
+        
+        grid = {'fingerprint': result['fingerprint'], 'snapshot': result}
+        self.grid_cache[key] = grid
+        return result, grid
+    
+    @staticmethod
+    def grid_value(grid, field, compute):
+        """Cache kaydından türetilmiş alan - Başka bir çağıran oluşturduysa eksik alanı snapshot'tan hesapla"""
+        if field not in grid:
+            grid[field] = compute(grid['snapshot'])
+        return grid[field]
+    
+    def record_unchanged(self, target_date_str, grid):
+        """Değişmeyen yoklamayı geçmişe önceki saatlerle yaz - İptal profili gözlem sayısını kaybetmesin"""
+        if grid.get('hours') is None:
+            return
+        
+        try:
+            self.slot_history.append(datetime.now(), parse_turkish_date(target_date_str), grid['hours'])
+        except Exception as e:
+            logging.warning(f"⚠️ Slot geçmişi yazılamadı: {e}")
+    
+    def record_observation(self, target_date_str, snapshot, only_date=None):
+        """Yoklamayı geçmiş deposuna (ve açıksa korpusa) yaz - Yazılan saatleri döndürür, hata yoklamayı bozmaz"""
+        slots = snapshot['slots']
+        
+        if self.corpus:
+            self.record_corpus_page('calendar', target_date_str, dict(snapshot, only_date=only_date))
+        
+        try:
+            target_dt = parse_turkish_date(target_date_str)
+            if not target_dt:
+                return None
+            
+            hours = {int(slot['hour'][:2]) for slot in slots
+                     if slot['active'] and slot['date'] == target_date_str and slot['hour'][:2].isdigit()}
+            self.slot_history.append(datetime.now(), target_dt, hours)
+            return hours
+        except Exception as e:
+            logging.warning(f"⚠️ Slot geçmişi yazılamadı: {e}")
+            return None
+    
+    def _next_poll_delay(self, check_interval, opening_instant, final_warmup_done):
+        """Bir sonraki yoklamaya kadar bekleme - Açılış anını kaçırma"""
+        if final_warmup_done:
+            return check_interval
+        
+        until_open = (opening_instant - datetime.now()).total_seconds()
+        checkpoints = [until_open - self.warmup_lead_seconds]
+        if until_open > self.session_monitor.refresh_before:
+            checkpoints.append(until_open - self.session_monitor.refresh_before)
+        return max(0, min([check_interval] + checkpoints))
+    
+    def prepare_war_zone(self, target):
+        """WAR ZONE hazırlığı - Pre-load, ısıtma ve slotların açılmasını bekleme"""
         current_time = datetime.now()
+        opening_instant = target.get('opening') or get_opening_instant(current_time, self.target_day)
+        prep_until = opening_instant - timedelta(minutes=4)
+        logging.info(f"🕛 Açılış anı: {opening_instant.strftime('%d.%m %H:%M:%S')}")
+        
+        # Açılıştan önce mevcut rezervasyonlar - Eski kayıtlar zafer sayılmasın
+        self.capture_reservation_baseline()
+        
+        # Zorlanmış WAR ZONE (gündüz / manuel tetik): saatlerce bekleme yok, doğrudan saldırı
+        lead = opening_instant - current_time
+        if lead > self.prep_max_lead:
+            logging.info(f"⏭️ Açılışa {lead.total_seconds() / 60:.0f} dakika var - Hazırlık atlanıyor, doğrudan saldırı")
+            self.trace.event('prep_skipped', lead_seconds=round(lead.total_seconds()))
+            return True
         
         # 23:54-23:56 arası hazırlık
-        if current_time.hour == 23 and current_time.minute < 56:
+        if current_time < prep_until:
             logging.info("⏳ 23:56'ya kadar hazırlık yapılıyor...")
             
             # Pre-load: Hedef tarihe git
-            if self.navigate_to_target_date(target['turkish_date']):
+            with self.tab_guard():
+                preloaded = self.navigate_to_target_date(target['turkish_date'])
+                if preloaded:
+                    # Hazırlık boşluğunda bağlantıları ve cache'i ısıt
+                    self.warm_up_connections("prep")
+            
+            if preloaded:
                 logging.info("✅ Pre-load tamamlandı, 23:56 bekleniyor...")
                 
                 # 23:56'ya kadar bekle
-                target_time = current_time.replace(minute=56, second=0, microsecond=0)
-                wait_seconds = (target_time - datetime.now()).total_seconds()
+                wait_seconds = (prep_until - datetime.now()).total_seconds()
                 
                 if wait_seconds > 0:
-                    logging.info(f"⏰ {wait_seconds:.0f} saniye 23:56 bekleniyor...")
-                    time.sleep(wait_seconds)
+                    logging.info(f"⏰ {wait_seconds:.0f} saniye 23:56 bekleniyor (oturum izleniyor)...")
+                    self.session_monitor.wait_until(prep_until, target['turkish_date'])
         
         # 23:56'DAN İTİBAREN SLOT KONTROLÜ - ★ ANA DEĞİŞİKLİK
         current_time = datetime.now()
-        if (current_time.hour == 23 and current_time.minute >= 56) or (current_time.hour == 0 and current_time.minute <= 10):
+        if prep_until <= current_time < opening_instant + timedelta(minutes=11):
             logging.info("🕐 23:56+ - Slotların açılması bekleniyor...")
-            if not self.wait_for_slots_to_open(target['turkish_date'], max_wait_minutes=10):  # 10 dakika bekle
+            if not self.wait_for_slots_to_open(target['turkish_date'], max_wait_minutes=10,
+                                               opening_instant=opening_instant):  # 10 dakika bekle
                 logging.error("❌ Slotlar zamanında açılmadı!")
                 return False
         
+        return True
+    
+    def run_war_zone_attack(self, target):
+        """WAR ZONE saldırısı - 23:56'dan itibaren slot kontrolü"""
+        logging.info("🔥 WAR ZONE ATTACK BAŞLADI!")
+        
+        if not self.prepare_war_zone(target):
+            return False
+        
         # Ana saldırı (slotlar açıldıktan sonra)
+        if self.orchestrator == "asyncio":
+            return AttackOrchestrator(self, target, "WAR_ZONE", poll_interval=1.0, max_seconds=300).run_sync()
+        
         attack_start = time.time()
         max_attack_time = 300  # 5 dakika
         attack_interval = 1.0   # 1 saniye (daha da agresif!)
@@ -849,31 +2919,34 @@ class DualAttackHalisahaBot:
         
         attack_count = 0
         
-        while attack_count < max_attacks and (time.time() - attack_start) < max_attack_time:
+        while (attack_count < max_attacks and (time.time() - attack_start) < max_attack_time
+               and not self.retry_policy.expired()):
             attack_count += 1
             attack_time = datetime.now()
             
             logging.info(f"🔥 WAR ZONE Attack #{attack_count}/{max_attacks} - {attack_time.strftime('%H:%M:%S')} - 🔥 ACTIVE 🔥")
             
             # Hedef tarihe git ve slot ara
-            if self.navigate_to_target_date(target['turkish_date']):
-                if self.find_and_reserve_slot(target['turkish_date'], "WAR_ZONE"):
-                    total_elapsed = time.time() - attack_start
-                    
-                    self.send_email(
-                        f"🔥 {target['day_name']} WAR ZONE VICTORY!",
-                        f"""🔥 WAR ZONE VICTORY!
+            with self.tab_guard():
+                reserved = self.attack_once(target['turkish_date'], "WAR_ZONE")
+            
+            if reserved:
+                total_elapsed = time.time() - attack_start
+                
+                self.send_email(
+                    f"🔥 {target['day_name']} WAR ZONE VICTORY!",
+                    f"""🔥 WAR ZONE VICTORY!
                         
     📅 Tarih: {target['turkish_date']} ({target['day_name']})
     🔢 Attack: #{attack_count}/{max_attacks}
     ⏱️ Süre: {total_elapsed:.0f}s
     🔥 Phase: WAR ZONE (Slot açıldıktan sonra)
     ⏰ Victory Time: {attack_time.strftime('%H:%M:%S')}
-    🏟️ Tesis: Kalamış Spor Tesisi
+    🏟️ Tesis: {self.reserved_facility or self.facilities[0]['name']}
     
     Slotlar açılır açılmaz yakaladık! 🎯"""
-                    )
-                    return True
+                )
+                return True
             
             time.sleep(attack_interval)
         
@@ -901,37 +2974,55 @@ class DualAttackHalisahaBot:
         scavenger_start = time.time()
         max_scavenger_time = 900  # 15 dakika
         scavenger_interval = 8  # 8 saniyede bir (daha az agresif)
-        max_scavenger_attacks = int(max_scavenger_time // scavenger_interval)
+        
+        # Geçmişe göre tempo - İptal beklenen dakikalarda sık, ölü zamanda seyrek
+        poll_plan = self.slot_history.scavenger_plan(
+            target['date_obj'].weekday(), datetime.now(), max_scavenger_time, default_interval=scavenger_interval
+        )
+        hot_minutes = sum(1 for interval in poll_plan if interval < scavenger_interval)
+        logging.info(f"📈 Yoklama planı: {hot_minutes}/{len(poll_plan)} sıcak dakika")
+        
+        self.capture_reservation_baseline()
+        
+        if self.orchestrator == "asyncio":
+            return AttackOrchestrator(self, target, "SCAVENGER", poll_interval=scavenger_interval,
+                                      max_seconds=max_scavenger_time, poll_plan=poll_plan).run_sync()
+        
+        max_scavenger_attacks = int(sum(60 // interval for interval in poll_plan))
         
         scavenger_count = 0
         
-        while scavenger_count < max_scavenger_attacks and (time.time() - scavenger_start) < max_scavenger_time:
+        while (scavenger_count < max_scavenger_attacks and (time.time() - scavenger_start) < max_scavenger_time
+               and not self.retry_policy.expired()):
             scavenger_count += 1
             scavenger_time = datetime.now()
             
             logging.info(f"🏴‍☠️ SCAVENGER Attack #{scavenger_count}/{max_scavenger_attacks} - {scavenger_time.strftime('%H:%M:%S')}")
             
             # Hedef tarihe git ve düşen slotları ara
-            if self.navigate_to_target_date(target['turkish_date']):
-                if self.find_and_reserve_slot(target['turkish_date'], "SCAVENGER"):
-                    total_elapsed = time.time() - scavenger_start
-                    
-                    self.send_email(
-                        f"🏴‍☠️ {target['day_name']} SCAVENGER VICTORY!",
-                        f"""🏴‍☠️ SCAVENGER MODE VICTORY!
+            with self.tab_guard():
+                reserved = self.attack_once(target['turkish_date'], "SCAVENGER")
+            
+            if reserved:
+                total_elapsed = time.time() - scavenger_start
+                
+                self.send_email(
+                    f"🏴‍☠️ {target['day_name']} SCAVENGER VICTORY!",
+                    f"""🏴‍☠️ SCAVENGER MODE VICTORY!
                         
 📅 Tarih: {target['turkish_date']} ({target['day_name']})
 🔢 Attack: #{scavenger_count}/{max_scavenger_attacks}
 ⏱️ Süre: {total_elapsed:.0f}s
 🏴‍☠️ Phase: SCAVENGER MODE (03:25+)
 ⏰ Victory Time: {scavenger_time.strftime('%H:%M:%S')}
-🏟️ Tesis: Kalamış Spor Tesisi
+🏟️ Tesis: {self.reserved_facility or self.facilities[0]['name']}
 
 Düşen rezervasyonu kaptık! 🎯"""
-                    )
-                    return True
+                )
+                return True
             
-            time.sleep(scavenger_interval)
+            elapsed_minute = int((time.time() - scavenger_start) // 60)
+            time.sleep(poll_plan[min(elapsed_minute, len(poll_plan) - 1)])
         
         # SCAVENGER başarısız
         total_elapsed = time.time() - scavenger_start
@@ -949,37 +3040,533 @@ Slot çok hızlı dolmuş olabilir. 📊"""
         )
         return False
     
-    def run_dual_attack(self):
-        """DUAL ATTACK ana fonksiyon - Mode aware"""
-        start_time = time.time()
+    def plan_job(self, target_day, mode, now=None):
+        """Bir işin bir sonraki penceresini açılış takviminden al (açılış anı, başlangıç, bitiş, hedef)"""
+        now = now or datetime.now()
+        now_local = to_istanbul(now)
+        planner = get_planner(now)
         
+        # WAR ZONE: 00:00 açılışı (-6dk/+16dk), SCAVENGER: düşen rezervasyonlar 03:25 civarı
+        entry = planner.next_opening(target_day, now)
+        if entry and entry['jobs'][mode]['end'] <= now_local:
+            entry = planner.entries.get((target_day, entry['opening_date'] + timedelta(days=7)))
+        if not entry:
+            return None
+        
+        job = entry['jobs'][mode]
+        target = self.calculate_target_date(target_day, now=job['opening'])
+        if not target:
+            return None
+        
+        return {
+            'day': target_day, 'mode': mode, 'target': target,
+            'opening': to_runner_local(job['opening']),
+            'start': to_runner_local(job['start']),
+            'end': to_runner_local(job['end'])
+        }
+    
+    def _open_job_tab(self, plan):
+        """İş için yeni sekme aç ve iş botunu bu tarayıcıya bağla"""
+        with self.tab_lock:
+            self.driver.switch_to.new_window('tab')
+            handle = self.driver.current_window_handle
+            self.tab_state['active'] = handle
+            self.driver.get(self.target_facility_url)
+        
+        worker = DualAttackHalisahaBot(target_day=plan['day'])
+        worker.driver = self.driver
+        worker.trace = self.trace
+        worker.tab_handle = handle
+        worker.tab_lock = self.tab_lock
+        worker.tab_state = self.tab_state
+        worker.tab_executor = self.tab_executor
+        worker.cdp = self.cdp
+        worker.host = self
+        worker.retry_policy = RetryPolicy(deadline=plan['end'])
+        return worker
+    
+    def reattach_worker(self, worker):
+        """Paylaşılan tarayıcı çöktüyse yeniden başlat ve işe yeni sekme aç"""
+        with self.tab_lock:
+            if worker.driver is self.driver and not self.restart_shared_browser("iş sekmesi çöktü"):
+                return False
+            
+            self.driver.switch_to.new_window('tab')
+            worker.tab_handle = self.driver.current_window_handle
+            self.tab_state['active'] = worker.tab_handle
+            self.driver.get(self.target_facility_url)
+            worker.driver = self.driver
+            worker.cdp = self.cdp
+        return True
+    
+    def _close_job_tab(self, worker):
+        """İş sekmesini kapat ve ana sekmeye dön"""
         try:
-            # Hedef tarih hesapla
-            target = self.calculate_target_date()
-            if not target:
-                raise Exception("Hedef tarih hesaplanamadı")
+            with self.tab_lock:
+                worker.close_facility_tabs()
+                if self.cdp is not None:
+                    self.cdp.forget(worker.tab_handle)
+                self.driver.switch_to.window(worker.tab_handle)
+                self.driver.close()
+                self.driver.switch_to.window(self.tab_handle)
+                self.tab_state['active'] = self.tab_handle
+        except Exception as e:
+            logging.warning(f"⚠️ Sekme kapatma hatası: {e}")
+    
+    def _run_job(self, worker, plan, results):
+        """Tek işi kendi sekmesinde çalıştır"""
+        job_start = time.time()
+        try:
+            if plan['mode'] == "WAR_ZONE":
+                success = worker.run_war_zone_attack(plan['target'])
+            else:
+                success = worker.run_scavenger_attack(plan['target'])
+        except Exception as e:
+            logging.error(f"❌ {plan['day']} {plan['mode']} iş hatası: {e}")
+            success = False
+        
+        self.trace.event('job_done', day=plan['day'], mode=plan['mode'], success=success,
+                         seconds=round(time.time() - job_start, 1))
+        results.append({'day': plan['day'], 'mode': plan['mode'], 'success': success})
+    
+    def run_job_group(self, group):
+        """Çakışan işleri aynı tarayıcıda, ayrı sekmelerde eşzamanlı çalıştır"""
+        results = []
+        workers = [(self._open_job_tab(plan), plan) for plan in group]
+        
+        try:
+            if len(workers) == 1:
+                self._run_job(workers[0][0], workers[0][1], results)
+            else:
+                threads = [
+                    threading.Thread(target=self._run_job, args=(worker, plan, results),
+                                     name=f"{plan['day']}-{plan['mode']}")
+                    for worker, plan in workers
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            for worker, _ in workers:
+                self._close_job_tab(worker)
+        return results
+    
+    def start_shared_browser(self):
+        """Paylaşılan tarayıcıyı başlat - Driver, login, facility ve sekme kilidi"""
+        if not self.setup_driver():
+            raise Exception("Driver setup başarısız")
+        if not self.login():
+            raise Exception("Login başarısız")
+        if not self.navigate_to_facility():
+            raise Exception("Sayfa yönlendirme başarısız")
+        
+        self.tab_handle = self.driver.current_window_handle
+        if self.tab_lock is None:
+            self.tab_lock = threading.RLock()
+            self.tab_state = {}
+            self.tab_executor = SharedTabExecutor(self.tab_lock, self.tab_state)
+        self.tab_executor.attach(self.driver)
+        self.tab_state['active'] = self.tab_handle
+        self.browser_started = time.time()
+    
+    def restart_shared_browser(self, reason):
+        """Tarayıcıyı kapatıp sıfırdan başlat"""
+        logging.warning(f"♻️ Tarayıcı yeniden başlatılıyor: {reason}")
+        self.trace.event('browser_restart', reason=reason)
+        
+        try:
+            self.driver.quit()
+        except:
+            pass
+        self.driver = None
+        
+        try:
+            self.start_shared_browser()
+            return True
+        except Exception as e:
+            logging.error(f"❌ Tarayıcı yeniden başlatılamadı: {e}")
+            return False
+    
+    def browser_alive(self):
+        """Tarayıcı sağlık kontrolü - Tek ucuz komut"""
+        try:
+            with self.tab_guard():
+                return self.driver.execute_script("return document.readyState") is not None
+        except Exception as e:
+            logging.warning(f"⚠️ Tarayıcı sağlık kontrolü başarısız: {e}")
+            return False
+    
+    def _idle_until(self, wake_time, health_interval=300, recycle_hours=24):
+        """Pencereye kadar uyu - Arada sağlık kontrolü ve periyodik tarayıcı yenileme"""
+        while not self.shutdown_event.is_set():
+            remaining = (wake_time - datetime.now()).total_seconds()
+            if remaining <= 0:
+                return True
             
-            # Attack mode belirle
-            attack_mode = get_attack_mode()
-            current_time = datetime.now()
+            if self.shutdown_event.wait(min(remaining, health_interval)):
+                break
             
-            logging.info(f"🚀 {attack_mode} Halısaha Bot başladı - {self.target_day}")
-            logging.info(f"🎯 Hedef: {target['day_name']} - {target['turkish_date']}")
-            logging.info(f"⏰ Başlangıç zamanı: {current_time.strftime('%H:%M:%S')}")
-            logging.info(f"🎯 Attack Mode: {attack_mode}")
-            logging.info("="*60)
+            if self.driver is None or not self.browser_alive():
+                self.restart_shared_browser("sağlık kontrolü")
+            elif (time.time() - self.browser_started) > recycle_hours * 3600 and remaining > 600:
+                # Günlerce açık kalan Chrome'un belleği şişmesin
+                self.restart_shared_browser("periyodik yenileme")
+        return False
+    
+    def _request_shutdown(self, signum, frame):
+        """SIGTERM/SIGINT - Mevcut iş bitince düzgünce kapan"""
+        logging.info(f"🛑 Kapanma sinyali alındı ({signum})")
+        self.shutdown_event.set()
+    
+    def run_daemon(self, jobs, lead_minutes=3):
+        """DAEMON - Sıcak tarayıcı ve oturumla bir sonraki pencereyi bekle, çalış, tekrarla"""
+        self.shutdown_event = threading.Event()
+        signal.signal(signal.SIGTERM, self._request_shutdown)
+        signal.signal(signal.SIGINT, self._request_shutdown)
+        
+        history = deque(maxlen=50)
+        
+        try:
+            self.start_shared_browser()
+            logging.info(f"👹 DAEMON başladı - {len(jobs)} iş izleniyor")
+            
+            while not self.shutdown_event.is_set():
+                plans = [self.plan_job(day, mode) for day, mode in jobs]
+                plans = [p for p in plans if p]
+                if not plans:
+                    raise Exception("Planlanacak iş yok")
+                
+                group = group_overlapping_jobs(plans)[0]
+                wake_time = min(p['start'] for p in group) - timedelta(minutes=lead_minutes)
+                names = ", ".join(f"{p['day']} {p['mode']}" for p in group)
+                logging.info(f"💤 Sonraki pencere: {names} - Uyanış: {wake_time.strftime('%d.%m %H:%M')}")
+                
+                if not self._idle_until(wake_time):
+                    break
+                
+                # Uyanış - Tarayıcı ve oturum sıcak mı?
+                if not self.browser_alive() and not self.restart_shared_browser("pencere öncesi"):
+                    continue
+                self.session_monitor.check(phase="daemon")
+                
+                logging.info(f"🚀 İş grubu başlıyor: {names}")
+                results = self.run_job_group(group)
+                history.extend(results)
+                
+                self.trace.save("daemon_trace.json")
+                
+                # Aynı pencereyi tekrar planlamamak için bitişe kadar bekle
+                self._idle_until(max(p['end'] for p in group))
             
-            # Driver setup
-            if not self.setup_driver():
-                raise Exception("Driver setup başarısız")
+        except Exception as e:
+            logging.error(f"❌ Daemon hatası: {str(e)}")
+            self.send_email("❌ Daemon Hatası", f"Hata: {str(e)}")
+        
+        finally:
+            logging.info(f"🛑 Daemon kapanıyor - {len(history)} iş sonucu")
+            self.trace.save("daemon_trace.json")
+            if self.driver:
+                try:
+                    self.driver.quit()
+                    logging.info("🔒 Browser kapatıldı")
+                except:
+                    pass
+    
+    def run_schedule(self, jobs, prep_minutes=3):
+        """SCHEDULER - Tek tarayıcı ve tek oturumla tüm işleri sırayla/eşzamanlı yürüt"""
+        results = []
+        
+        try:
+            plans = [self.plan_job(day, mode) for day, mode in jobs]
+            plans = [p for p in plans if p]
+            if not plans:
+                raise Exception("Planlanacak iş yok")
             
-            # Login
-            if not self.login():
-                raise Exception("Login başarısız")
+            for plan in sorted(plans, key=lambda p: p['start']):
+                logging.info(f"🗓️ {plan['day']} {plan['mode']}: {plan['start'].strftime('%d.%m %H:%M')} → "
+                             f"{plan['end'].strftime('%H:%M')} (hedef {plan['target']['turkish_date']})")
+            
+            # Tek tarayıcı, tek login
+            self.start_shared_browser()
+            
+            for group in group_overlapping_jobs(plans):
+                wake_time = min(p['start'] for p in group) - timedelta(minutes=prep_minutes)
+                sleep_seconds = (wake_time - datetime.now()).total_seconds()
+                
+                if sleep_seconds > 0:
+                    # Pencereler arası boşluk - Soğuk başlangıç yok, sadece uyku
+                    logging.info(f"💤 {sleep_seconds / 60:.0f} dakika uyku - Uyanış: {wake_time.strftime('%d.%m %H:%M')}")
+                    time.sleep(sleep_seconds)
+                
+                # Pencere öncesi oturumu tazele
+                self.session_monitor.check(phase="schedule")
+                
+                names = ", ".join(f"{p['day']} {p['mode']}" for p in group)
+                logging.info(f"🚀 İş grubu başlıyor: {names}")
+                results.extend(self.run_job_group(group))
+            
+            summary = "\n".join(f"{'✅' if r['success'] else '❌'} {r['day']} {r['mode']}" for r in results)
+            logging.info(f"🗓️ Scheduler tamamlandı:\n{summary}")
+            
+        except Exception as e:
+            logging.error(f"❌ Scheduler hatası: {str(e)}")
+            self.send_email("❌ Scheduler Hatası", f"Hata: {str(e)}")
+        
+        finally:
+            self.trace.save("scheduler_trace.json")
+            if self.driver:
+                try:
+                    self.driver.save_screenshot("scheduler_result.png")
+                    self.driver.quit()
+                    logging.info("🔒 Browser kapatıldı")
+                except:
+                    pass
+        
+        return results
+    
+    def load_session_cache(self):
+        """Önceki login'in cookie'lerini oku - Eski veya başka kullanıcıya aitse yok say"""
+        if not self.session_cache_path:
+            return None
+        
+        try:
+            with open(self.session_cache_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ Oturum cache'i okunamadı: {e}")
+            return None
+        
+        if data.get('user') != hashlib.sha256(self.username.encode('utf-8')).hexdigest()[:16]:
+            return None
+        
+        age = time.time() - data.get('saved_at', 0)
+        if age > self.session_cache_max_age:
+            logging.info(f"🍪 Oturum cache'i eski ({age / 60:.0f} dk), login yapılacak")
+            return None
+        
+        logging.info(f"🍪 Oturum cache'i bulundu ({age / 60:.0f} dk önce)")
+        return data.get('cookies') or None
+    
+    def save_session_cache(self):
+        """Login sonrası cookie'leri sadece kullanıcının okuyabileceği dosyaya yaz"""
+        if not self.session_cache_path:
+            return
+        
+        try:
+            payload = {
+                'user': hashlib.sha256(self.username.encode('utf-8')).hexdigest()[:16],
+                'saved_at': time.time(),
+                'cookies': self.driver.get_cookies()
+            }
+            fd = os.open(self.session_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+        except Exception as e:
+            logging.warning(f"⚠️ Oturum cache'i yazılamadı: {e}")
+    
+    def start_session(self, cookies):
+        """Cache'teki cookie'lerle oturumu geri yükle - Geçersizse normal login"""
+        if cookies:
+            try:
+                # Cookie eklemek için alan adında bir sayfa gerekli
+                self.driver.get(self.base_url)
+                for cookie in cookies:
+                    self.driver.add_cookie({k: v for k, v in cookie.items()
+                                            if k in ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry')})
+                
+                if self.probe_session():
+                    logging.info("✅ Oturum cache'ten geri yüklendi - Login atlandı")
+                    self.trace.event('session_cache', hit=True)
+                    return True
+                self.driver.delete_all_cookies()
+            except Exception as e:
+                logging.warning(f"⚠️ Oturum cache'i uygulanamadı: {e}")
+            self.trace.event('session_cache', hit=False)
+        
+        if not self.login():
+            return False
+        self.save_session_cache()
+        return True
+    
+    def plan_run(self):
+        """Hedef tarih, saldırı modu ve global deadline - Tarayıcı gerektirmez"""
+        target = self.calculate_target_date()
+        if not target:
+            raise Exception("Hedef tarih hesaplanamadı")
+        
+        attack_mode = get_attack_mode()
+        current_time = datetime.now()
+        
+        logging.info(f"🚀 {attack_mode} Halısaha Bot başladı - {self.target_day}")
+        logging.info(f"🎯 Hedef: {target['day_name']} - {target['turkish_date']}")
+        logging.info(f"⏰ Başlangıç zamanı: {current_time.strftime('%H:%M:%S')}")
+        logging.info(f"🎯 Attack Mode: {attack_mode}")
+        
+        # Global deadline - WAR ZONE: açılış + 16dk, SCAVENGER: 15dk + pay
+        if attack_mode == "WAR_ZONE":
+            self.retry_policy = RetryPolicy(deadline=target['opening'] + timedelta(minutes=16))
+        elif attack_mode == "SCAVENGER":
+            self.retry_policy = RetryPolicy(deadline=current_time + timedelta(minutes=17))
+        
+        if self.retry_policy.deadline:
+            logging.info(f"⏰ Global deadline: {self.retry_policy.deadline.strftime('%H:%M:%S')}")
+        return target, attack_mode, current_time
+    
+    def _timed_stage(self, name, fn, *args):
+        """Bootstrap aşamasını çalıştır, başlangıç ofseti ve süresini trace'e yaz"""
+        started = time.time()
+        try:
+            return fn(*args)
+        finally:
+            self.trace.event('bootstrap_stage', stage=name,
+                             start=round(started - self.bootstrap_started, 3),
+                             seconds=round(time.time() - started, 3))
+    
+    def bootstrap(self):
+        """Açılış - Bağımsız parçalar paralel, sadece gerçek bağımlılıklarda beklenir
+        
+        Chrome ──────────┐
+        Oturum cache'i ──┴─> oturum (cookie/login) ─> tesis sayfası ─┐
+        Hedef tarih / açılış anı / deadline (ana thread) ─────────────┴─> saldırı
+        SMTP bağlantısı: arka planda, kritik yolda değil
+        """
+        self.bootstrap_started = time.time()
+        executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="bootstrap")
+        ready = False
+        
+        try:
+            driver_ready = executor.submit(self._timed_stage, 'chrome', self.setup_driver)
+            cookies = executor.submit(self._timed_stage, 'session_cache', self.load_session_cache)
+            self.notifier = executor.submit(self._timed_stage, 'notifier', self.connect_notifier)
             
-            # Halısaha sayfasına git
-            if not self.navigate_to_facility():
+            # Takvim hesabı Chrome açılırken ana thread'de
+            plan = self._timed_stage('schedule', self.plan_run)
+            
+            if not driver_ready.result():
+                raise Exception("Driver setup başarısız")
+            if not self._timed_stage('session', self.start_session, cookies.result()):
+                raise Exception("Login başarısız")
+            if not self._timed_stage('facility', self.navigate_to_facility):
                 raise Exception("Sayfa yönlendirme başarısız")
+            ready = True
+        finally:
+            # Hata varsa yarım kalan Chrome'un self.driver'a yazılmasını bekle ki kapatılabilsin
+            executor.shutdown(wait=not ready)
+        
+        critical_path = time.time() - self.bootstrap_started
+        sequential = sum(e['seconds'] for e in self.trace.find('bootstrap_stage'))
+        logging.info(f"🚀 Bootstrap: kritik yol {critical_path:.1f}s (biten aşamalar sıralı {sequential:.1f}s)")
+        self.trace.event('bootstrap', critical_path=round(critical_path, 3), sequential=round(sequential, 3))
+        logging.info("="*60)
+        return plan
+    
+    def run_census(self, weeks, week_timeout=20, output_prefix="slot_census"):
+        """Salt okunur slot sayımı - Haftaları bir kez gez, tarih × saat × durum matrisini yaz
+        
+        Sadece readRange / snapshotSlots / clickNav kullanılır, rezervasyon popup'ı hiç açılmaz.
+        Her hafta en fazla week_timeout saniye sürer; yüklenmeyen haftada o tesisin sayımı biter.
+        """
+        census_start = time.time()
+        records = []
+        week_log = []
+        
+        for index, facility in enumerate(self.facilities):
+            logging.info(f"📊 Sayım: {facility['name']} - {weeks} hafta")
+            
+            try:
+                if index > 0:
+                    self.activate_facility(index)
+                    self.driver.get(facility['url'])
+                
+                for week in range(weeks):
+                    week_start = time.time()
+                    
+                    # Hafta tek çağrıda - Takvim gelene kadar en fazla hafta bütçesi
+                    try:
+                        snapshot = WebDriverWait(self.driver, week_timeout, poll_frequency=0.2,
+                                                 ignored_exceptions=(NoSuchElementException,)).until(
+                            lambda d: self.page_call('snapshotSlots')
+                        )
+                    except TimeoutException:
+                        logging.warning(f"⚠️ {facility['name']}: hafta {week + 1} {week_timeout}s içinde okunamadı")
+                        break
+                    
+                    for slot in snapshot['slots']:
+                        slot_dt = parse_turkish_date(slot['date'])
+                        records.append({
+                            'facility': facility['name'],
+                            'week': snapshot['range'],
+                            'date': slot['date'],
+                            'weekday': slot_dt.weekday() if slot_dt else None,
+                            'hour': slot['hour'],
+                            'active': slot['active'],
+                            'state': slot['state']
+                        })
+                    
+                    active = sum(1 for slot in snapshot['slots'] if slot['active'])
+                    week_log.append({
+                        'facility': facility['name'], 'range': snapshot['range'],
+                        'slots': len(snapshot['slots']), 'active': active,
+                        'seconds': round(time.time() - week_start, 2)
+                    })
+                    logging.info(f"   📅 {snapshot['range']}: {len(snapshot['slots'])} slot, {active} müsait")
+                    self.trace.event('census_week', **week_log[-1])
+                    
+                    if week == weeks - 1:
+                        break
+                    
+                    self.page_call('clickNav', "next")
+                    self._wait_for_range_change(snapshot['range'], max(1, week_timeout - (time.time() - week_start)))
+                    if self.page_call('readRange') == snapshot['range']:
+                        logging.warning(f"⚠️ {facility['name']}: sonraki hafta bütçe içinde yüklenmedi")
+                        break
+                        
+            except Exception as e:
+                logging.error(f"❌ {facility['name']} sayım hatası: {e}")
+        
+        self.activate_facility(0)
+        
+        matrix = {}
+        for record in records:
+            matrix.setdefault(record['facility'], {}).setdefault(record['date'], {})[record['hour']] = record['active']
+        
+        with open(f"{output_prefix}.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(timespec='seconds'),
+                'weeks': week_log,
+                'matrix': matrix,
+                'slots': records
+            }, f, ensure_ascii=False, indent=1)
+        
+        with open(f"{output_prefix}.csv", 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=['facility', 'week', 'date', 'weekday', 'hour', 'active', 'state'])
+            writer.writeheader()
+            writer.writerows(records)
+        
+        # Hedeflemeye değer gün/saatler - Haftalar boyunca en sık müsait kalanlar
+        open_counts = Counter((r['weekday'], r['hour']) for r in records if r['active'] and r['weekday'] is not None)
+        day_names = ["Pazartesi", "Salı", "Çarşamba", "Perşembe", "Cuma", "Cumartesi", "Pazar"]
+        for (weekday, hour), count in open_counts.most_common(5):
+            logging.info(f"   🟢 {day_names[weekday]} {hour}: {count} hafta müsait")
+        
+        elapsed = time.time() - census_start
+        logging.info(f"✅ Sayım bitti: {len(week_log)} hafta, {len(records)} slot, {elapsed:.0f}s → {output_prefix}.json/.csv")
+        self.trace.event('census', weeks=len(week_log), slots=len(records), seconds=round(elapsed, 1))
+        return bool(week_log)
+    
+    def run_dual_attack(self):
+        """DUAL ATTACK ana fonksiyon - Mode aware"""
+        start_time = time.time()
+        
+        try:
+            # Tarayıcı, oturum, takvim ve bildirim paralel hazırlanır
+            target, attack_mode, current_time = self.bootstrap()
+            
+            if attack_mode in ("WAR_ZONE", "SCAVENGER"):
+                self.start_hot_spare(target['turkish_date'])
             
             success = False
             
@@ -1005,6 +3592,8 @@ Slot çok hızlı dolmuş olabilir. 📊"""
             self.send_email(f"❌ {self.target_day} Bot Hatası", f"Hata: {str(e)}")
         
         finally:
+            self.trace.save(f"{get_attack_mode().lower()}_{self.target_day.lower()}_trace.json")
+            self.stop_hot_spare()
             if self.driver:
                 try:
                     attack_mode = get_attack_mode()
@@ -1015,13 +3604,297 @@ Slot çok hızlı dolmuş olabilir. 📊"""
                 except:
                     pass
 
+class AttackOrchestrator:
+    """asyncio saldırı orkestratörü
+    
+    Yoklama, rezervasyon, doğrulama, oturum kontrolü ve bildirimler ortak bir
+    deadline altında ayrı görevler olarak çalışır. WebDriver thread-safe olmadığı
+    için tüm tarayıcı komutları tek thread'lik bir executor'da sıraya girer;
+    doğrulama (HTTP) ve e-posta ayrı executor'da, yoklamayla paralel ilerler.
+    """
+    
+    def __init__(self, bot, target, attack_mode, poll_interval, max_seconds, poll_plan=None):
+        self.bot = bot
+        self.target = target
+        self.attack_mode = attack_mode
+        self.poll_interval = poll_interval
+        self.poll_plan = poll_plan
+        
+        self.deadline = datetime.now() + timedelta(seconds=max_seconds)
+        if bot.retry_policy.deadline:
+            self.deadline = min(self.deadline, bot.retry_policy.deadline)
+        
+        self.polls = 0
+        self.attempts = 0
+        self.candidates = []
+        self.victory = None
+        self.verifying = None
+        self.notifications = set()
+    
+    def run_sync(self):
+        """Senkron koddan çağrı için"""
+        return asyncio.run(self.run())
+    
+    async def _on_driver(self, fn, *args):
+        """Tarayıcı komutunu WebDriver executor'ında, işin sekmesinde çalıştır"""
+        def call():
+            with self.bot.tab_guard():
+                return fn(*args)
+        return await self.loop.run_in_executor(self.driver_executor, call)
+    
+    def _notify(self, subject, message):
+        """E-postayı arka planda gönder - Yoklamayı asla bekletmez"""
+        future = self.loop.run_in_executor(self.io_executor, self.bot.send_email, subject, message)
+        self.notifications.add(future)
+    
+    def _interval(self, start):
+        """Sıradaki yoklamaya kadar bekleme - Varsa geçmiş bazlı plan"""
+        if not self.poll_plan:
+            return self.poll_interval
+        minute = int((time.time() - start) // 60)
+        return self.poll_plan[min(minute, len(self.poll_plan) - 1)]
+    
+    async def _poll_loop(self):
+        """Yoklama görevi - Yeni adayları rezervasyon görevine iletir"""
+        start = time.time()
+        date = self.target['turkish_date']
+        
+        failures = 0
+        
+        while not self.done.is_set():
+            self.polls += 1
+            try:
+                candidates = await self._on_driver(self.bot.poll_candidates, date)
+            except Exception as e:
+                failures += 1
+                if not await self._on_driver(self.bot.handle_failure, e, failures):
+                    self.done.set()
+                    return
+                continue
+            failures = 0
+            
+            if candidates:
+                self.candidates = candidates
+                self.candidate_event.set()
+            elif candidates is not None and self.polls % 10 == 1:
+                logging.info(f"⏳ Async yoklama #{self.polls} - Hedef saatlerde açık slot yok")
+            
+            await asyncio.sleep(self._interval(start))
+    
+    async def _reserve_loop(self):
+        """Rezervasyon görevi - Adayı tıklar, doğrulamayı arka plana bırakır
+        
+        Deneme hatası görevi bitirmez: hata sınıflandırılıp kurtarılır, bir sonraki
+        yoklamanın adaylarıyla devam edilir.
+        """
+        date = self.target['turkish_date']
+        failures = 0
+        
+        while not self.done.is_set():
+            await self.candidate_event.wait()
+            self.candidate_event.clear()
+            
+            # Önceki deneme doğrulanıyorsa sonucu bekle - Çift rezervasyon olmasın
+            if self.verifying is not None and await self.verifying:
+                return
+            self.verifying = None
+            
+            if not self.candidates:
+                continue
+            
+            candidate = self.candidates[0]
+            hour = candidate['hour']
+            self.attempts += 1
+            logging.info(f"🎯 Async deneme #{self.attempts}: {date} - {hour}")
+            
+            try:
+                ok = await self._on_driver(self.bot.reserve_candidate, date, candidate, self.attack_mode)
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logging.warning(f"⚠️ Async deneme #{self.attempts} hatası: {type(e).__name__}")
+                self.bot.trace.event('async_attempt', attempt=self.attempts, hour=hour,
+                                     facility=candidate['facility'], ok=False, error=type(e).__name__)
+                if not await self._on_driver(self.bot.handle_failure, e, failures):
+                    self.done.set()
+                    return
+                continue
+            
+            self.bot.trace.event('async_attempt', attempt=self.attempts, hour=hour,
+                                 facility=candidate['facility'], ok=ok)
+            
+            if ok:
+                self.verifying = asyncio.create_task(self._verify(hour, self.attempts))
+    
+    async def _verify(self, hour, attempt, timeout=15):
+        """Doğrulama görevi - HTTP ile tablo okunur, tarayıcı yoklamaya devam eder"""
+        verify_until = time.time() + timeout
+        
+        while time.time() < verify_until and not self.done.is_set():
+            try:
+                cookies = await self._on_driver(self.bot.driver.get_cookies)
+                rows = await self.loop.run_in_executor(self.io_executor, self.bot.fetch_reservation_rows_http, cookies)
+                match = self.bot.match_new_reservation(rows, hour)
+                if match:
+                    logging.info(f"🎉 ✅ REZERVASYON DOĞRULANDI: {match[0]} | {match[1]} | {match[2]}")
+                    self.victory = {'hour': hour, 'attempt': attempt, 'time': datetime.now(), 'row': match}
+                    self.bot.trace.event('async_verified', attempt=attempt, hour=hour)
+                    self.done.set()
+                    return True
+            except Exception as e:
+                logging.warning(f"⚠️ Doğrulama hatası: {e}")
+            
+            await asyncio.sleep(1.5)
+        
+        logging.error(f"❌ Deneme #{attempt} doğrulanamadı: {hour}")
+        self.bot.trace.event('async_unverified', attempt=attempt, hour=hour)
+        self.candidate_event.set()
+        return False
+    
+    async def _session_loop(self):
+        """Oturum görevi - Periyodik ucuz yoklama"""
+        date = self.target['turkish_date']
+        monitor = self.bot.session_monitor
+        
+        while not self.done.is_set():
+            await asyncio.sleep(monitor.probe_interval)
+            await self._on_driver(monitor.maybe_check, date, "attack")
+    
+    async def run(self):
+        """Tüm görevleri başlat, ortak deadline veya zafer anında hepsini iptal et"""
+        self.loop = asyncio.get_running_loop()
+        self.driver_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="webdriver")
+        self.io_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="attack-io")
+        self.candidate_event = asyncio.Event()
+        self.done = asyncio.Event()
+        
+        mode_emoji = "🔥" if self.attack_mode == "WAR_ZONE" else "🏴‍☠️"
+        logging.info(f"{mode_emoji} ASYNC {self.attack_mode} - Deadline: {self.deadline.strftime('%H:%M:%S')}")
+        attack_start = time.time()
+        
+        tasks = [
+            asyncio.create_task(self._poll_loop(), name="poll"),
+            asyncio.create_task(self._reserve_loop(), name="reserve"),
+            asyncio.create_task(self._session_loop(), name="session"),
+        ]
+        
+        try:
+            remaining = (self.deadline - datetime.now()).total_seconds()
+            await asyncio.wait_for(self.done.wait(), timeout=max(0, remaining))
+        except asyncio.TimeoutError:
+            logging.warning(f"⏰ {self.attack_mode} deadline doldu")
+        finally:
+            self.done.set()
+            if self.verifying is not None:
+                tasks.append(self.verifying)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        total_elapsed = time.time() - attack_start
+        target = self.target
+        
+        if self.victory:
+            self._notify(
+                f"{mode_emoji} {target['day_name']} {self.attack_mode} VICTORY!",
+                f"""{mode_emoji} {self.attack_mode} VICTORY! (async)
+
+📅 Tarih: {target['turkish_date']} ({target['day_name']})
+🕐 Saat: {self.victory['hour']}
+🔢 Deneme: #{self.victory['attempt']} ({self.polls} yoklama)
+⏱️ Süre: {total_elapsed:.0f}s
+⏰ Victory Time: {self.victory['time'].strftime('%H:%M:%S')}
+🏟️ Tesis: {self.victory['row'][0]}"""
+            )
+        else:
+            self._notify(
+                f"{mode_emoji} {target['day_name']} {self.attack_mode} Raporu",
+                f"""{mode_emoji} {self.attack_mode} RAPORU (async)
+
+📅 Tarih: {target['turkish_date']} ({target['day_name']})
+🔢 Yoklama: {self.polls} - Deneme: {self.attempts}
+⏱️ Süre: {total_elapsed:.0f}s
+
+Slot yakalanamadı."""
+            )
+        
+        # Bildirimler için sınırlı bekleme, sonra executor'ları kapat
+        await asyncio.wait(self.notifications, timeout=30)
+        self.driver_executor.shutdown(wait=True)
+        self.io_executor.shutdown(wait=False)
+        
+        self.bot.trace.event('async_done', mode=self.attack_mode, success=self.victory is not None,
+                             polls=self.polls, attempts=self.attempts, seconds=round(total_elapsed, 1))
+        return self.victory is not None
+
+def group_overlapping_jobs(plans):
+    """Zaman pencereleri çakışan işleri aynı gruba topla"""
+    groups = []
+    for plan in sorted(plans, key=lambda p: p['start']):
+        if groups and plan['start'] < max(p['end'] for p in groups[-1]):
+            groups[-1].append(plan)
+        else:
+            groups.append([plan])
+    return groups
+
 def main():
     target_day = os.environ.get('TARGET_DAY', 'PAZARTESI')
     
     # Test mode check
     test_mode = os.environ.get('TEST_MODE', 'false').lower() == 'true'
+    schedule_spec = os.environ.get('SCHEDULE_JOBS', '')
+    daemon_mode = os.environ.get('DAEMON_MODE', 'false').lower() == 'true'
+    
+    census_mode = os.environ.get('CENSUS_MODE', 'false').lower() == 'true'
     
-    if test_mode:
+    if census_mode:
+        # CENSUS MODE - Salt okunur çok haftalık müsaitlik matrisi
+        weeks = int(os.environ.get('CENSUS_WEEKS', '4'))
+        week_timeout = float(os.environ.get('CENSUS_WEEK_SECONDS', '20'))
+        
+        logging.info(f"📊 CENSUS MODE - {weeks} hafta, hafta başı en fazla {week_timeout:.0f}s")
+        logging.info("="*60)
+        
+        bot = DualAttackHalisahaBot()
+        try:
+            if not bot.setup_driver():
+                logging.error("Driver setup başarısız")
+                return
+            if not bot.start_session(bot.load_session_cache()):
+                logging.error("Login başarısız")
+                return
+            if not bot.navigate_to_facility():
+                logging.error("Facility navigation başarısız")
+                return
+            
+            bot.run_census(weeks, week_timeout, os.environ.get('CENSUS_OUTPUT', 'slot_census'))
+        except Exception as e:
+            logging.error(f"Sayım hatası: {e}")
+        finally:
+            bot.trace.save("census_trace.json")
+            if bot.driver:
+                bot.driver.quit()
+    elif daemon_mode and not test_mode:
+        # DAEMON MODE - STANDBY'da çıkmak yerine sıradaki pencereyi bekle
+        jobs = parse_schedule_jobs(schedule_spec) if schedule_spec else [
+            (day, mode) for day in DAY_MAP for mode in ("WAR_ZONE", "SCAVENGER")
+        ]
+        
+        logging.info(f"👹 DAEMON MODE - {len(jobs)} iş")
+        logging.info("="*60)
+        
+        bot = DualAttackHalisahaBot()
+        bot.run_daemon(jobs)
+    elif schedule_spec and not test_mode:
+        # SCHEDULER MODE - Tek tarayıcıdan birden fazla gün
+        jobs = parse_schedule_jobs(schedule_spec)
+        
+        logging.info(f"🗓️ SCHEDULER MODE - {len(jobs)} iş")
+        logging.info("="*60)
+        
+        bot = DualAttackHalisahaBot()
+        bot.run_schedule(jobs)
+    elif test_mode:
         # TEST MODE
         os.environ['ATTACK_MODE'] = 'WAR_ZONE_ONLY'
         logging.info(f"🧪 TEST MODE - Session Debug")
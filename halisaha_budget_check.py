@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Halısaha Bot - WebDriver Round-Trip Budget Check
+Sıcak yoldaki fonksiyonları sahte bir WebDriver üzerinde çalıştırır. Her komut
+sayılır ve simüle edilen saate gecikme olarak eklenir; bütçe aşılırsa çıkış
+kodu 1 olur. Tarayıcı, ağ veya gerçek bekleme gerekmez.
+
+Kullanım:
+    python halisaha_budget_check.py            # özet tablo
+    python halisaha_budget_check.py --verbose  # bot loglarıyla
+"""
+
+import os
+import sys
+import time
+import json
+import logging
+import argparse
+import tempfile
+from collections import Counter
+from datetime import datetime, timedelta
+
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, NoAlertPresentException
+
+import halisaha_bot
+from halisaha_bot import (
+    DualAttackHalisahaBot, PAGE_CALL_SCRIPT, PAGE_HELPER_JS, SESSION_PROBE_SCRIPT,
+    WARMUP_SCRIPT, WARMTH_SCRIPT, WARMTH_PROBE_SCRIPT
+)
+
+# Fonksiyon başına bütçe: toplam komut, driver.get, eleman bazlı komut ve simüle süre (ms)
+BUDGETS = {
+    'navigate_to_target_date (2 hafta ileri)': {'commands': 20, 'get': 0, 'element': 0, 'ms': 1500},
+    'navigate_to_target_date (hedef haftada)': {'commands': 4, 'get': 0, 'element': 0, 'ms': 150},
+    'wait_for_slots_to_open (açılış anı)': {'commands': 18, 'get': 0, 'element': 0, 'open_latency_ms': 500},
+    'find_and_reserve_slot': {'commands': 12, 'get': 1, 'element': 2, 'ms': 11500},
+    'find_and_reserve_slot (değişmeyen ızgara)': {'commands': 2, 'get': 0, 'element': 0, 'ms': 3100},
+    'sayım → yoklama (değişmeyen ızgara)': {'commands': 4, 'get': 0, 'element': 0, 'ms': 300},
+    'poll_candidates (CDP, hedef haftada)': {'commands': 2, 'get': 0, 'element': 0, 'ms': 75},
+    'poll_candidates (CDP, 2 hafta ileri)': {'commands': 22, 'get': 0, 'element': 0, 'ms': 1500},
+    'check_reservation_success': {'commands': 3, 'get': 1, 'element': 0, 'ms': 600},
+}
+
+# Eleman bazlı komutlar - Sıcak yolda helper'ın tek çağrısı yerine geçmemeli
+ELEMENT_COMMANDS = {'find_element', 'find_elements', 'get_attribute', 'click'}
+
+TARGET_DATE = "3 Kasım 2025"
+PREFERRED_HOUR = "20:00/21:00"
+WEEKS = [
+    ("20 Ekim 2025 - 26 Ekim 2025", ["20 Ekim 2025", "21 Ekim 2025", "22 Ekim 2025"]),
+    ("27 Ekim 2025 - 2 Kasım 2025", ["27 Ekim 2025", "28 Ekim 2025", "29 Ekim 2025"]),
+    ("3 Kasım 2025 - 9 Kasım 2025", ["3 Kasım 2025", "4 Kasım 2025", "5 Kasım 2025"]),
+]
+HOURS = ["17:00/18:00", "18:00/19:00", "19:00/20:00", "20:00/21:00", "21:00/22:00", "22:00/23:00"]
+
+class SimClock:
+    """Simüle saat - time.sleep beklemez, sadece saati ilerletir"""
+
+    def __init__(self, start):
+        self.now = start
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0, seconds)
+
+    def advance_ms(self, ms):
+        self.now += ms / 1000.0
+
+CLOCK = SimClock(datetime(2025, 10, 26, 23, 59, 50).timestamp())
+
+class SimDatetime(datetime):
+    """datetime.now() simüle saati okur"""
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.fromtimestamp(CLOCK.now, tz)
+
+class FakePage:
+    """Senaryolu DOM - Takvim haftaları, popup adımları ve rezervasyon tablosu"""
+
+    def __init__(self, week=0, open_at=None, nav_delay_ms=300, popup_delay_ms=150, rows=None):
+        self.week = week
+        self.pending = None  # (hafta, hazır olma anı)
+        self.open_at = open_at  # Hedef tarih slotlarının açılacağı an (None: hep açık)
+        self.nav_delay_ms = nav_delay_ms
+        self.popup_delay_ms = popup_delay_ms
+        self.popup = None  # (adım, görünür olma anı)
+        self.page = 'calendar'
+        self.rows = list(rows or [])
+
+    def _settle(self):
+        if self.pending and CLOCK.now >= self.pending[1]:
+            self.week, self.pending = self.pending[0], None
+
+    def _active(self, date, hour):
+        if date == TARGET_DATE and self.open_at is not None and CLOCK.now < self.open_at:
+            return False
+        return hour in (PREFERRED_HOUR, "18:00/19:00")
+
+    def readRange(self):
+        if self.page != 'calendar':
+            return {'__hsb': 'absent', 'missing': ['yonlendirme-info']}
+        self._settle()
+        return WEEKS[self.week][0]
+
+    def snapshotSlots(self, only_date=None):
+        if self.page != 'calendar':
+            return {'__hsb': 'absent', 'missing': ['yonlendirme-info']}
+        self._settle()
+        week_range, dates = WEEKS[self.week]
+        slots = [{'date': d, 'hour': h, 'active': self._active(d, h),
+                  'state': 'lesson active' if self._active(d, h) else 'lesson'}
+                 for d in dates for h in HOURS if not only_date or d == only_date]
+        return {'range': week_range, 'slots': slots}
+
+    def gridFingerprint(self, only_date=None):
+        snapshot = self.snapshotSlots(only_date)
+        if '__hsb' in snapshot:
+            return snapshot
+        return "%x:%d" % (hash((snapshot['range'], tuple((s['date'], s['hour'], s['state']) for s in snapshot['slots'])))
+                          & 0xffffffff, len(snapshot['slots']))
+
+    def snapshotIfChanged(self, prev_fingerprint, only_date=None):
+        fingerprint = self.gridFingerprint(only_date)
+        if isinstance(fingerprint, dict):
+            return fingerprint
+        if fingerprint == prev_fingerprint:
+            return {'unchanged': True, 'fingerprint': fingerprint}
+        return dict(self.snapshotSlots(only_date), fingerprint=fingerprint)
+
+    def clickNav(self, direction):
+        self._settle()
+        step = 1 if direction == 'next' else -1
+        self.pending = (min(max(self.week + step, 0), len(WEEKS) - 1), CLOCK.now + self.nav_delay_ms / 1000.0)
+        return True
+
+    def clickSlot(self, date, hour):
+        if not self._active(date, hour) or date not in WEEKS[self.week][1]:
+            return False
+        self.popup = ('bootbox', CLOCK.now + self.popup_delay_ms / 1000.0)
+        return True
+
+    def startReservation(self):
+        if not self.popup_visible():
+            return False
+        self.popup = ('confirm', CLOCK.now + self.popup_delay_ms / 1000.0)
+        return True
+
+    def confirmReservation(self):
+        if not self.popup or self.popup[0] != 'confirm' or CLOCK.now < self.popup[1]:
+            return False
+        self.popup = None
+        self.rows.append(["Kalamış Spor Tesisi", PREFERRED_HOUR.replace("/", " - "), "Ön Onaylı"])
+        return True
+
+    def readReservations(self):
+        if self.page != 'reservations':
+            return {'__hsb': 'absent', 'missing': ['AreaReservationTable']}
+        return [list(row) for row in self.rows]
+
+    def reservations_html(self):
+        body = "".join("<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in self.rows)
+        return f'<table id="AreaReservationTable"><thead><tr><th>Tesis</th></tr></thead><tbody>{body}</tbody></table>'
+
+    def popup_visible(self):
+        return self.popup is not None and CLOCK.now >= self.popup[1]
+
+class FakeSwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    @property
+    def alert(self):
+        self.driver.command('get_alert')
+        raise NoAlertPresentException("no alert")
+
+    def window(self, handle):
+        self.driver.command('switch_window')
+
+class FakeElement:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def click(self):
+        self.driver.command('click')
+
+    def get_attribute(self, name):
+        self.driver.command('get_attribute')
+        return None
+
+class FakeDriver:
+    """Her komutu sayan ve simüle gecikme ekleyen WebDriver"""
+
+    def __init__(self, page, latency_ms=25, get_ms=450):
+        self.page = page
+        self.latency_ms = latency_ms
+        self.get_ms = get_ms
+        self.commands = Counter()
+        self.sim_ms = 0.0
+        self.switch_to = FakeSwitchTo(self)
+        self.capabilities = {}
+        self.url = "https://spor.kadikoy.bel.tr/spor-salonu/kalamis-spor?activityCategories=2"
+
+    def command(self, name, ms=None):
+        ms = self.latency_ms if ms is None else ms
+        self.commands[name] += 1
+        self.sim_ms += ms
+        CLOCK.advance_ms(ms)
+
+    def reset(self):
+        self.commands = Counter()
+        self.sim_ms = 0.0
+
+    @property
+    def current_url(self):
+        self.command('current_url')
+        return self.url
+
+    @property
+    def current_window_handle(self):
+        self.command('window_handle')
+        return "CDwindow-FAKE"
+
+    @property
+    def page_source(self):
+        self.command('page_source')
+        return self.page.reservations_html() if self.page.page == 'reservations' else "<html></html>"
+
+    def get(self, url):
+        self.command('get', self.get_ms)
+        self.url = url
+        self.page.page = 'reservations' if "MyReservation" in url else 'calendar'
+        self.page.popup = None
+
+    def execute_script(self, script, *args):
+        self.command('execute_script')
+        if script == PAGE_CALL_SCRIPT:
+            version, name, call_args = args
+            return getattr(self.page, name)(*call_args)
+        if script == WARMTH_SCRIPT:
+            return []
+        if script == PAGE_HELPER_JS:
+            return None
+        if "outerHTML" in script:
+            return "<html></html>"
+        return "complete"
+
+    def execute_async_script(self, script, *args):
+        self.command('execute_async_script', self.latency_ms * 4)
+        if script == SESSION_PROBE_SCRIPT:
+            return {'status': 200, 'url': args[0]}
+        if script == WARMUP_SCRIPT:
+            return {'ok': True, 'assets': 3, 'endpoints': 1, 'ms': 80}
+        if script == WARMTH_PROBE_SCRIPT:
+            return [{'name': args[0], 'dns': 0, 'connect': 0, 'ttfb': 40}]
+        return {}
+
+    def set_script_timeout(self, seconds):
+        self.command('set_timeout')
+
+    def find_element(self, by, value):
+        self.command('find_element')
+        if by == By.CLASS_NAME and value == "bootbox" and self.page.popup_visible():
+            return FakeElement(self)
+        if by == By.CLASS_NAME and value == "yonlendirme-info" and self.page.page == 'calendar':
+            return FakeElement(self)
+        raise NoSuchElementException(f"{by}={value}")
+
+    def find_elements(self, by, value):
+        self.command('find_elements')
+        return []
+
+    def get_cookies(self):
+        self.command('get_cookies')
+        return []
+
+class FakeCdp:
+    """evaluate_many'yi tek tur sayan DevTools taşıyıcısı - İfadeleri sahte sayfada çalıştırır"""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def evaluate(self, handle, expression):
+        return self.evaluate_many(handle, [expression])[0]
+
+    def evaluate_many(self, handle, expressions):
+        self.driver.command('cdp_evaluate')
+        return [self._run(expression) for expression in expressions]
+
+    def _run(self, expression):
+        version, name, call_args = json.loads(expression[expression.rindex(".apply(null, ") + 13:-1])
+        return getattr(self.driver.page, name)(*call_args)
+
+def make_bot(page):
+    bot = DualAttackHalisahaBot(target_day="PAZARTESI")
+    bot.driver = FakeDriver(page)
+    bot.reservation_baseline = []
+    return bot
+
+def scenario_navigate_far():
+    bot = make_bot(FakePage(week=0))
+    return bot, lambda: bot.navigate_to_target_date(TARGET_DATE), {}
+
+def scenario_navigate_here():
+    bot = make_bot(FakePage(week=2))
+    return bot, lambda: bot.navigate_to_target_date(TARGET_DATE), {}
+
+def scenario_wait_for_open():
+    opening = SimDatetime(2025, 10, 27, 0, 0, 0)
+    CLOCK.now = (opening - timedelta(seconds=10)).timestamp()
+    page = FakePage(week=2, open_at=opening.timestamp())
+    bot = make_bot(page)
+    extra = {}
+
+    def run():
+        ok = bot.wait_for_slots_to_open(TARGET_DATE, max_wait_minutes=2, opening_instant=opening)
+        extra['open_latency_ms'] = (CLOCK.now - opening.timestamp()) * 1000
+        return ok
+    return bot, run, extra
+
+def scenario_find_and_reserve():
+    bot = make_bot(FakePage(week=2))
+    return bot, lambda: bot.find_and_reserve_slot(TARGET_DATE, "WAR_ZONE"), {}
+
+def scenario_find_unchanged():
+    # Slotlar kapalı: ilk yoklama ızgarayı işler, ikincisi parmak iziyle kısa devre yapmalı
+    bot = make_bot(FakePage(week=2, open_at=CLOCK.now + 3600))
+    bot.find_and_reserve_slot(TARGET_DATE, "SCAVENGER")
+    return bot, lambda: not bot.find_and_reserve_slot(TARGET_DATE, "SCAVENGER"), {}
+
+def scenario_count_then_poll():
+    # Bekleme döngüsünün sayımı cache kaydını açar; aynı ızgarada yoklama adayları yine bulmalı
+    bot = make_bot(FakePage(week=2))
+    bot._count_target_slots(TARGET_DATE)
+
+    def run():
+        candidates = bot.poll_candidates(TARGET_DATE)
+        return bool(candidates) and candidates[0]['hour'] == PREFERRED_HOUR and bot.unchanged_polls == 1
+    return bot, run, {}
+
+def scenario_check_reservation():
+    page = FakePage(week=2, rows=[["Kalamış Spor Tesisi", "20:00 - 21:00", "Ön Onaylı"]])
+    bot = make_bot(page)
+    return bot, lambda: bot.check_reservation_success(TARGET_DATE, PREFERRED_HOUR), {}
+
+def scenario_cdp_poll_here():
+    # Hedef haftada: alert kontrolü + aralık ve parmak izli snapshot tek pipelined turda
+    bot = make_bot(FakePage(week=2))
+    bot.cdp = FakeCdp(bot.driver)
+
+    def run():
+        candidates = bot.poll_candidates(TARGET_DATE)
+        return bool(candidates) and candidates[0]['hour'] == PREFERRED_HOUR
+    return bot, run, {}
+
+def scenario_cdp_poll_far():
+    # Hedef haftada değil: toplu tur aralığı görür, klasik navigasyona düşer
+    bot = make_bot(FakePage(week=0))
+    bot.cdp = FakeCdp(bot.driver)
+
+    def run():
+        candidates = bot.poll_candidates(TARGET_DATE)
+        return bool(candidates) and candidates[0]['hour'] == PREFERRED_HOUR
+    return bot, run, {}
+
+SCENARIOS = [
+    ('navigate_to_target_date (2 hafta ileri)', scenario_navigate_far),
+    ('navigate_to_target_date (hedef haftada)', scenario_navigate_here),
+    ('wait_for_slots_to_open (açılış anı)', scenario_wait_for_open),
+    ('find_and_reserve_slot', scenario_find_and_reserve),
+    ('find_and_reserve_slot (değişmeyen ızgara)', scenario_find_unchanged),
+    ('sayım → yoklama (değişmeyen ızgara)', scenario_count_then_poll),
+    ('poll_candidates (CDP, hedef haftada)', scenario_cdp_poll_here),
+    ('poll_candidates (CDP, 2 hafta ileri)', scenario_cdp_poll_far),
+    ('check_reservation_success', scenario_check_reservation),
+]
+
+def check(name, build):
+    """Senaryoyu çalıştır, sonucu ve bütçe ihlallerini döndür"""
+    bot, run, extra = build()
+    bot.driver.reset()
+    started = CLOCK.now
+
+    try:
+        ok, error = run(), None
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {e}"
+
+    measured = {
+        'commands': sum(bot.driver.commands.values()),
+        'get': bot.driver.commands['get'],
+        'element': sum(bot.driver.commands[c] for c in ELEMENT_COMMANDS),
+        'ms': (CLOCK.now - started) * 1000,
+    }
+    measured.update(extra)
+
+    violations = [] if ok else [f"istisna: {error}" if error else "fonksiyon başarısız döndü"]
+    for key, limit in BUDGETS[name].items():
+        if measured[key] > limit:
+            violations.append(f"{key} {measured[key]:.0f} > {limit}")
+    return measured, dict(bot.driver.commands), violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte WebDriver ile sıcak yol round-trip bütçesi")
+    parser.add_argument('--verbose', action='store_true', help="Bot loglarını göster")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logging.getLogger().setLevel(logging.CRITICAL)
+
+    os.environ.setdefault('HALISAHA_USERNAME', 'budget')
+    os.environ.setdefault('HALISAHA_PASSWORD', 'budget')
+    os.environ['SLOT_HISTORY_DIR'] = tempfile.mkdtemp(prefix="budget_history_")
+    for name in ('TARGET_FACILITIES', 'RECORD_CORPUS', 'TRANSPORT', 'NOTIFICATION_EMAIL'):
+        os.environ.pop(name, None)
+
+    # Simüle saat: bekleme yok, WebDriverWait ve bot aynı saati görür
+    time.time = CLOCK.time
+    time.monotonic = CLOCK.time
+    time.sleep = CLOCK.sleep
+    halisaha_bot.datetime = SimDatetime
+
+    failures = 0
+    for name, build in SCENARIOS:
+        measured, commands, violations = check(name, build)
+        status = "✅" if not violations else "❌"
+        print(f"{status} {name}: {measured['commands']} komut, {measured['get']} get, "
+              f"{measured['element']} eleman komutu, {measured['ms']:.0f} ms simüle"
+              + (f", açılıştan {measured['open_latency_ms']:.0f} ms sonra" if 'open_latency_ms' in measured else ""))
+        if args.verbose or violations:
+            print(f"   {commands}")
+        for violation in violations:
+            print(f"   ⚠️ {violation}")
+        failures += bool(violations)
+
+    if failures:
+        print(f"❌ {failures} fonksiyon bütçeyi aştı")
+        return 1
+
+    print("✅ Tüm sıcak yol fonksiyonları bütçe içinde")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
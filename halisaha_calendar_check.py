@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+📅 Halısaha Bot - Golden Açılış Takvimi Kontrolü
+Açılış takvimini sabit başlangıç tarihleri için üretir ve elle doğrulanmış
+golden JSON ile karşılaştırır: hedef tarih, açılış anı (yerel + UTC, DST dahil),
+pencereler, tatiller ve belirli anlardaki mod / hedef aramaları.
+
+Kullanım:
+    python halisaha_calendar_check.py            # Golden ile karşılaştır
+    python halisaha_calendar_check.py --update   # Golden'ı yeniden yaz (diff'i gözden geçir!)
+    python halisaha_calendar_check.py --crons    # Workflow'lar için UTC cron satırları
+"""
+
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime, timezone
+
+from halisaha_bot import ISTANBUL, DAY_MAP, OpeningPlanner, parse_holidays
+
+GOLDEN_PATH = "halisaha_calendar_golden.json"
+
+# (ad, başlangıç, hafta, ek tatiller, yoklanacak anlar)
+CASES = [
+    ("istanbul_2026_bayramlar", "2026-04-10T12:00", 8, "2026-05-27:Kurban Bayramı,2026-05-28:Kurban Bayramı", [
+        "2026-04-12T23:53", "2026-04-12T23:54", "2026-04-13T00:10", "2026-04-13T00:11",
+        "2026-04-13T03:19", "2026-04-13T03:20", "2026-04-13T03:45", "2026-04-13T03:46",
+        "2026-04-13T04:59", "2026-04-13T05:00", "2026-04-15T23:55", "2026-04-17T23:55",
+    ]),
+    # Türkiye 2015'te hâlâ yaz saati uyguluyordu (29 Mart'ta +02 -> +03)
+    ("istanbul_2015_yaz_saati", "2015-03-20T12:00", 3, "", [
+        "2015-03-22T23:58", "2015-03-29T23:58", "2015-03-30T03:30",
+    ]),
+]
+
+def build_case(start, weeks, holidays, probes):
+    planner = OpeningPlanner(
+        weeks=weeks,
+        start=datetime.fromisoformat(start).replace(tzinfo=ISTANBUL),
+        holidays=parse_holidays(holidays)
+    )
+    lookups = []
+    for probe in probes:
+        at = datetime.fromisoformat(probe).replace(tzinfo=ISTANBUL)
+        targets = {}
+        for day in DAY_MAP:
+            entry = planner.next_opening(day, at)
+            targets[day] = entry['target_date'].isoformat() if entry else None
+        lookups.append({'at': at.isoformat(), 'mode': planner.mode_at(at), 'targets': targets})
+    return {'openings': planner.to_rows(), 'lookups': lookups}
+
+def build_all():
+    return {name: build_case(start, weeks, holidays, probes)
+            for name, start, weeks, holidays, probes in CASES}
+
+def diff_rows(name, section, got, want):
+    """Satır satır karşılaştır - İlk farkları okunur şekilde döndür"""
+    diffs = []
+    if len(got) != len(want):
+        diffs.append(f"{name}/{section}: {len(got)} satır != {len(want)} satır")
+    for index, (g, w) in enumerate(zip(got, want)):
+        for key in sorted(set(g) | set(w)):
+            if g.get(key) != w.get(key):
+                diffs.append(f"{name}/{section}[{index}].{key}: {g.get(key)!r} != {w.get(key)!r}")
+    return diffs
+
+def print_crons(weeks):
+    """Bir sonraki açılışların UTC cron karşılıkları - Workflow'lar elle UTC yazılıyor"""
+    planner = OpeningPlanner(weeks=weeks)
+    seen = set()
+    for (day, _), entry in sorted(planner.entries.items(), key=lambda item: item[0][1]):
+        for mode, job in entry['jobs'].items():
+            start = job['start']
+            utc = start.astimezone(timezone.utc)
+            line = f"{day:<10} {mode:<10} '{utc.minute} {utc.hour} * * {utc.isoweekday() % 7}'"
+            if line not in seen:
+                seen.add(line)
+                print(f"{line}  # {start.strftime('%d.%m.%Y %H:%M')} İstanbul")
+
+def main():
+    parser = argparse.ArgumentParser(description="Golden açılış takvimi kontrolü")
+    parser.add_argument('--golden', default=GOLDEN_PATH, help="Golden JSON dosyası")
+    parser.add_argument('--update', action='store_true', help="Golden dosyasını yeniden yaz")
+    parser.add_argument('--crons', action='store_true', help="UTC cron satırlarını yazdır")
+    parser.add_argument('--weeks', type=int, default=2, help="--crons için hafta sayısı")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    if args.crons:
+        print_crons(args.weeks)
+        return 0
+
+    calendar = build_all()
+
+    if args.update:
+        with open(args.golden, 'w', encoding='utf-8') as f:
+            json.dump(calendar, f, ensure_ascii=False, indent=1)
+            f.write("\n")
+        print(f"📝 Golden yazıldı: {args.golden} ({sum(len(c['openings']) for c in calendar.values())} açılış)")
+        return 0
+
+    with open(args.golden, encoding='utf-8') as f:
+        golden = json.load(f)
+
+    diffs = []
+    for name in sorted(set(calendar) | set(golden)):
+        if name not in golden or name not in calendar:
+            diffs.append(f"{name}: sadece {'üretilen' if name in calendar else 'golden'} tarafta")
+            continue
+        for section in ('openings', 'lookups'):
+            diffs.extend(diff_rows(name, section, calendar[name][section], golden[name][section]))
+
+    if diffs:
+        print(f"❌ {len(diffs)} takvim farkı:")
+        for diff in diffs[:20]:
+            print(f"   {diff}")
+        return 1
+
+    total = sum(len(c['openings']) for c in calendar.values())
+    probes = sum(len(c['lookups']) for c in calendar.values())
+    print(f"✅ Açılış takvimi golden ile aynı ({total} açılış, {probes} arama)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+🧪 Halısaha Bot - Offline Replay Benchmark
+Kaydedilmiş korpus üzerinde slot/aralık parser'ı, sıralama ve rezervasyon
+satırı eşleştirmesini tarayıcı ve ağ olmadan çalıştırır.
+
+Kullanım:
+    python halisaha_replay.py --corpus corpus --repeat 20
+"""
+
+import sys
+import time
+import logging
+import argparse
+import tracemalloc
+
+from halisaha_bot import (
+    CORPUS_VERSION, CorpusRecorder, parse_calendar_html, parse_reservation_rows,
+    is_date_in_range, get_navigation_direction, rank_slot_candidates, match_reservation_row
+)
+
+# Kalamış varsayılan tercih sırası (bot ile aynı)
+PREFERRED_HOURS = [
+    "20:00/21:00", "19:00/20:00", "21:00/22:00",
+    "22:00/23:00", "18:00/19:00", "17:00/18:00",
+    "20:00-21:00", "19:00-20:00", "21:00-22:00",
+    "22:00-23:00", "18:00-19:00", "17:00-18:00"
+]
+
+def normalize(text):
+    """innerText ile parser metni arasındaki boşluk farklarını yok say"""
+    return " ".join((text or "").split())
+
+def slot_key(slot):
+    return (slot['date'], slot['hour'], slot['active'])
+
+def replay_calendar(entry, html):
+    """Takvim sayfası: parse + aralık kontrolü + sıralama"""
+    expected = entry['expected']
+    target = entry['target_date']
+
+    parsed = parse_calendar_html(html, only_date=expected.get('only_date'))
+    diffs = []
+
+    if normalize(parsed['range']) != normalize(expected.get('range')):
+        diffs.append(f"range: '{parsed['range']}' != '{expected.get('range')}'")
+
+    got = sorted(slot_key(s) for s in parsed['slots'])
+    want = sorted(slot_key(s) for s in expected.get('slots', []))
+    if got != want:
+        missing = set(want) - set(got)
+        extra = set(got) - set(want)
+        diffs.append(f"slots: {len(missing)} eksik, {len(extra)} fazla (ör. {sorted(missing or extra)[:3]})")
+
+    if parsed['range']:
+        is_date_in_range(target, parsed['range'])
+        get_navigation_direction(target, parsed['range'])
+
+    ranked = rank_slot_candidates(parsed['slots'], target, PREFERRED_HOURS)
+    expected_ranked = rank_slot_candidates(expected.get('slots', []), target, PREFERRED_HOURS)
+    if ranked != expected_ranked:
+        diffs.append(f"ranking: {ranked[:3]} != {expected_ranked[:3]}")
+
+    return diffs
+
+def replay_reservations(entry, html):
+    """Rezervasyon sayfası: tablo parse + satır eşleştirme"""
+    expected = entry['expected']
+    rows = parse_reservation_rows(html)
+    diffs = []
+
+    got = [[normalize(c) for c in row] for row in rows]
+    want = [[normalize(c) for c in row] for row in expected.get('rows', [])]
+    if got != want:
+        diffs.append(f"rows: {len(got)} satır != {len(want)} satır")
+
+    if bool(match_reservation_row(got, expected.get('hour'))) != bool(match_reservation_row(want, expected.get('hour'))):
+        diffs.append("match: eşleştirme sonucu farklı")
+
+    return diffs
+
+REPLAYERS = {'calendar': replay_calendar, 'reservations': replay_reservations}
+
+# Elle yazılmış kenar durumları - Kayıtlı korpus olmasa da her çalıştırmada doğrulanır
+BUILTIN_PAGES = [
+    ({'kind': 'calendar', 'file': 'builtin/aralik-icinde-br.html', 'target_date': "5 Kasım 2025",
+      'expected': {'range': "3 Kasım 2025 - 9 Kasım 2025", 'slots': [
+          {'date': "5 Kasım 2025", 'hour': "19:00/20:00", 'active': False},
+          {'date': "5 Kasım 2025", 'hour': "20:00/21:00", 'active': True},
+      ]}},
+     """<div class="takvim">
+<div class="yonlendirme-info"><span>3 Kasım 2025<br>
+ - 9 Kasım 2025</span><img src="ok.png"></div>
+<div class="lesson" data-dateformatted="5 Kasım 2025" data-hour="19:00/20:00"></div>
+<div class="lesson active" data-dateformatted="5 Kasım 2025" data-hour="20:00/21:00"></div>
+</div>"""),
+]
+
+def run_pass(pages):
+    """Tüm korpus üzerinden bir tur - Tür bazında süre ve fark listesi"""
+    timings = {}
+    diffs = []
+
+    for entry, html in pages:
+        replayer = REPLAYERS.get(entry['kind'])
+        if not replayer:
+            continue
+
+        started = time.perf_counter()
+        page_diffs = replayer(entry, html)
+        timings[entry['kind']] = timings.get(entry['kind'], 0.0) + (time.perf_counter() - started)
+
+        diffs.extend(f"{entry['file']}: {d}" for d in page_diffs)
+    return timings, diffs
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline korpus replay benchmark")
+    parser.add_argument('--corpus', default='corpus', help="Korpus kök klasörü")
+    parser.add_argument('--version', type=int, default=CORPUS_VERSION, help="Korpus sürümü")
+    parser.add_argument('--repeat', type=int, default=10, help="Ölçüm turu sayısı")
+    args = parser.parse_args()
+
+    # Parser'ların INFO logları ölçümü bozmasın
+    logging.getLogger().setLevel(logging.WARNING)
+
+    try:
+        pages = CorpusRecorder.load(args.corpus, args.version)
+    except FileNotFoundError:
+        print(f"⚠️ Korpus yok: {args.corpus}/v{args.version} - Sadece yerleşik sayfalar")
+        pages = []
+    pages = BUILTIN_PAGES + pages
+    counts = {}
+    for entry, _ in pages:
+        counts[entry['kind']] = counts.get(entry['kind'], 0) + 1
+    print(f"📚 Korpus v{args.version}: {len(pages)} sayfa {counts}")
+
+    # Doğruluk + bellek: tek tur tracemalloc altında
+    tracemalloc.start()
+    _, diffs = run_pass(pages)
+    current, peak = tracemalloc.get_traced_memory()
+    snapshot = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    allocations = sum(stat.count for stat in snapshot.statistics('filename'))
+    print(f"🧠 Bellek: tepe {peak / 1024:.0f} KiB, tur sonu {current / 1024:.0f} KiB, {allocations} canlı blok")
+
+    # Throughput: tracemalloc kapalı
+    totals = {}
+    for _ in range(args.repeat):
+        timings, _ = run_pass(pages)
+        for kind, seconds in timings.items():
+            totals[kind] = totals.get(kind, 0.0) + seconds
+
+    for kind, seconds in sorted(totals.items()):
+        processed = counts[kind] * args.repeat
+        print(f"⚡ {kind}: {processed / seconds:,.0f} sayfa/sn ({seconds / processed * 1000:.3f} ms/sayfa)")
+
+    if diffs:
+        print(f"❌ {len(diffs)} doğruluk farkı:")
+        for diff in diffs[:20]:
+            print(f"   {diff}")
+        return 1
+
+    print("✅ Tüm sayfalar beklenen sonuçla aynı")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⚡ Halısaha Bot - Transport Benchmark
+Yerel bir takvim sayfasında helper çağrılarının komut başı gecikmesini
+klasik WebDriver (execute_script) ile kalıcı DevTools soketi arasında ölçer.
+
+Kullanım:
+    pip install websocket-client
+    python halisaha_transport_bench.py --repeat 200 --batch 10
+"""
+
+import sys
+import time
+import logging
+import argparse
+import threading
+import statistics
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from halisaha_bot import (
+    USER_AGENT, PAGE_HELPER_JS, PAGE_HELPER_VERSION, PAGE_CALL_SCRIPT,
+    CdpTransport, CdpTransportError
+)
+
+TARGET_DATE = "27 Ekim 2025"
+WEEK = ["27 Ekim 2025", "28 Ekim 2025", "29 Ekim 2025", "30 Ekim 2025",
+        "31 Ekim 2025", "1 Kasım 2025", "2 Kasım 2025"]
+
+def calendar_html():
+    """Gerçek sayfayla aynı seçicilere sahip bir haftalık takvim"""
+    lessons = []
+    for d, date in enumerate(WEEK):
+        for hour in range(8, 24):
+            label = f"{hour:02d}:00/{hour + 1:02d}:00"
+            state = "lesson active" if (d + hour) % 3 == 0 else "lesson"
+            lessons.append(f'<div class="{state}" data-dateformatted="{date}" data-hour="{label}">{label}</div>')
+
+    return f"""<!DOCTYPE html><html><head><meta charset="utf-8"></head><body>
+<a id="area-onceki-hafta">&lt;</a><span class="yonlendirme-info">{WEEK[0]} - {WEEK[-1]}</span><a id="area-sonraki-hafta">&gt;</a>
+<div class="calendar">{''.join(lessons)}</div>
+</body></html>""".encode('utf-8')
+
+class CalendarHandler(BaseHTTPRequestHandler):
+    body = calendar_html()
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+def start_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), CalendarHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def start_driver():
+    options = Options()
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument(f'--user-agent={USER_AGENT}')
+    return webdriver.Chrome(options=options)
+
+def measure(label, repeat, call, per_call=1):
+    """call() çağrısını repeat kez ölç - Komut başı ms istatistikleri"""
+    call()  # Isınma
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        call()
+        samples.append((time.perf_counter() - started) * 1000 / per_call)
+
+    samples.sort()
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<28} ort {statistics.mean(samples):7.3f} ms | p50 {statistics.median(samples):7.3f} ms | "
+          f"p95 {p95:7.3f} ms | min {samples[0]:7.3f} ms")
+    return statistics.median(samples)
+
+def main():
+    parser = argparse.ArgumentParser(description="WebDriver vs DevTools soketi gecikme karşılaştırması")
+    parser.add_argument('--repeat', type=int, default=200, help="Ölçüm sayısı")
+    parser.add_argument('--batch', type=int, default=10, help="Pipelining grubundaki komut sayısı")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    server = start_server()
+    driver = start_driver()
+    try:
+        driver.get(f"http://127.0.0.1:{server.server_address[1]}/")
+        driver.execute_script(PAGE_HELPER_JS)
+
+        call_args = (PAGE_HELPER_VERSION, 'snapshotSlots', [TARGET_DATE])
+        classic = lambda: driver.execute_script(PAGE_CALL_SCRIPT, *call_args)
+        expected = classic()
+        print(f"📄 Yerel takvim: {len(expected['slots'])} slot ({TARGET_DATE}), {args.repeat} ölçüm")
+
+        classic_ms = measure("WebDriver execute_script", args.repeat, classic)
+
+        try:
+            cdp = CdpTransport.from_driver(driver)
+        except CdpTransportError as e:
+            print(f"❌ DevTools taşıyıcısı kurulamadı: {e}")
+            return 1
+
+        handle = driver.current_window_handle
+        expression = CdpTransport.call_expression(PAGE_CALL_SCRIPT, call_args)
+
+        if cdp.evaluate(handle, expression) != expected:
+            print("❌ DevTools sonucu WebDriver sonucuyla aynı değil")
+            return 1
+
+        cdp_ms = measure("DevTools Runtime.evaluate", args.repeat, lambda: cdp.evaluate(handle, expression))
+        batch = [expression] * args.batch
+        pipelined_ms = measure(f"DevTools pipelined x{args.batch}", args.repeat,
+                               lambda: cdp.evaluate_many(handle, batch), per_call=args.batch)
+        cdp.close()
+
+        print(f"⚡ Hızlanma (p50): tekil {classic_ms / cdp_ms:.1f}x, pipelined {classic_ms / pipelined_ms:.1f}x")
+        return 0
+    finally:
+        driver.quit()
+        server.shutdown()
+
+if __name__ == "__main__":
+    sys.exit(main())